@@ -4,15 +4,16 @@
 # Purpose: LLTSolver solves  (L @ L.T)*y=r for y using forward and backward substitution
 
 # Input Definition:
-# L: real valued lower triangle matrix nxn with nonzero diagonal elements
-# r: column vector in R ** n
+# L: real valued lower triangle matrix nxn with nonzero diagonal elements. Either a dense np.array,
+# a scipy.sparse matrix or a CSR triple (indptr, indices, data) as returned by incompleteCholesky.
+# r: column vector in R ** n or matrix in R ** nxk (k right hand sides)
 # verbose: bool, if set to true, verbose information is displayed
 
 # Output Definition:
-# y: column vector in R ** n (solution in domain space)
+# y: column vector in R ** n or matrix in R ** nxk (solution in domain space)
 
 # Required files:
-# < none >
+# < none >, scipy is used for LAPACK trtrs and sparse triangular solves if it is installed
 
 # Test cases:
 # L = np.array([[2, 0, 0], [0.5, np.sqrt(15 / 4), 0], [0, 0, 2]], dtype=float)
@@ -25,34 +26,99 @@
 # y = LLTSolver(L,r)
 # should return y = [[1],[0],[2],[0],[3]]
 
+# L = np.array([[2, 0, 0], [0.5, np.sqrt(15 / 4), 0], [0, 0, 2]], dtype=float)
+# r = np.array([[5, 2], [5, 0.5], [4, 4]], dtype=float)
+# y = LLTSolver(L,r)
+# should return y = [[1, 0.5], [1, 0], [1, 1]]
+
 import numpy as np
 
+try:
+    import scipy.linalg as sl
+    import scipy.sparse as sp
+    import scipy.sparse.linalg as spl
+except ImportError:
+    sl = None
+    sp = None
+
+
 def LLTSolver(L: np.array, r: np.array, verbose=0):
 
     if verbose:
         print('Start LLTSolver...')
 
-    n = np.size(r)
-    s = r.copy()
-    for i in range(n):
-        for j in range(i):
-            s[i, 0] = s[i, 0] - L[i, j] * s[j, 0]
+    s = np.array(r, dtype=float)
 
-        if L[i, i] == 0:
+    if isinstance(L, tuple):
+        y = CSRLLTSolver(L, s)
+    elif sp is not None and sp.issparse(L):
+        L = sp.csr_matrix(L)
+        if np.any(L.diagonal() == 0):
             raise Exception('Zero diagonal element detected...')
 
-        s[i, 0] = s[i, 0] / L[i, i]
+        s = spl.spsolve_triangular(L, s, lower=True)
+        y = spl.spsolve_triangular(sp.csr_matrix(L.T), s, lower=False)
+    else:
+        if np.any(np.diag(L) == 0):
+            raise Exception('Zero diagonal element detected...')
 
-    y = s
+        if sl is not None:
+            # LAPACK trtrs for L and L.T, works on all columns of r at once
+            s = sl.solve_triangular(L, s, lower=True, check_finite=False)
+            y = sl.solve_triangular(L, s, lower=True, trans='T', check_finite=False)
+        else:
+            n = s.shape[0]
+            for i in range(n):
+                s[i] = (s[i] - L[i, :i] @ s[:i]) / L[i, i]
 
-    for i in range(n-1, -1, -1):
-        for j in range(n-1, i, -1):
-            y[i, 0] = y[i, 0] - L[j, i] * y[j, 0]
-
-        y[i, 0] = y[i, 0] / L[i, i]
+            y = s
+            for i in range(n-1, -1, -1):
+                y[i] = (y[i] - L[i+1:, i] @ y[i+1:]) / L[i, i]
 
     if verbose:
-        residual = (L@L.T)@y-r
+        if isinstance(L, tuple):
+            residual = CSRMatVec(L, CSRMatVec(L, y, transpose=True)) - r
+        else:
+            residual = L @ (L.T @ y) - r
         print('LLTSolver terminated with residual:')
         print(residual)
     return y
+
+
+def CSRMatVec(L: tuple, x: np.array, transpose=False):
+    indptr, indices, data = L
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    y = np.zeros(x.shape)
+    if transpose:
+        np.add.at(y, indices, data.reshape((-1,) + (1,) * (x.ndim - 1)) * x[rows])
+    else:
+        np.add.at(y, rows, data.reshape((-1,) + (1,) * (x.ndim - 1)) * x[indices])
+    return y
+
+
+def CSRLLTSolver(L: tuple, s: np.array):
+    indptr, indices, data = L
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    isDiag = indices == rows
+    diag = np.zeros(n)
+    diag[rows[isDiag]] = data[isDiag]
+    if np.any(diag == 0):
+        raise Exception('Zero diagonal element detected...')
+
+    # forward substitution with L, one vectorized dot product per row
+    for i in range(n):
+        row = slice(indptr[i], indptr[i + 1])
+        offDiag = ~isDiag[row]
+        s[i] = (s[i] - data[row][offDiag] @ s[indices[row][offDiag]]) / diag[i]
+
+    # backward substitution with L.T, row i of L is scattered into the remaining entries
+    y = s
+    for i in range(n-1, -1, -1):
+        row = slice(indptr[i], indptr[i + 1])
+        offDiag = ~isDiag[row]
+        y[i] = y[i] / diag[i]
+        y[indices[row][offDiag]] -= np.multiply.outer(data[row][offDiag], y[i])
+
+    return y
@@ -0,0 +1,76 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Block Preconditioned Conjugate Gradient Solver
+
+# Purpose: BlockCGSolver finds Y such that norm(A * Y[:, j] - B[:, j]) <= delta for all k columns of B.
+# All columns share the Krylov space, so A is applied to an nxk block once per step instead of k times.
+
+# Input Definition:
+# A: real valued spd matrix nxn, or matrix free operator with method .matvec() that accepts nxk blocks
+# B: matrix in R ** nxk, k right hand sides
+# delta: positive value, tolerance for termination. Default value: 1.0e-6.
+# verbose: bool, if set to true, verbose information is displayed
+# maxIter: positive integer, maximal number of block CG steps. If None, block CG runs until termination. Default value: None.
+# M: preconditioner object with method .apply(R) for nxk blocks. If None, no preconditioning is used. Default value: None.
+
+# Output Definition:
+# X: matrix in R ^ nxk (solutions in domain space)
+
+# Required files:
+# y = applyOperator(A, d) from linearOperator.py
+# M = identityPreconditioner() from preconditioners.py
+
+# Test cases:
+# A = np.array([[4, 1, 0], [1, 7, 0], [ 0, 0, 3]], dtype=float)
+# B = np.array([[5, 10], [8, 16], [3, 6]], dtype=float)
+# delta = 1.0e-6
+# X = BlockCGSolver(A, B, delta, 1)
+# should return X = [[1, 2], [1, 2], [1, 2]]
+
+
+import numpy as np
+import linearOperator as LO
+import preconditioners as PC
+
+
+def BlockCGSolver(A: np.array, B: np.array, delta=1.0e-6, verbose=0, maxIter=None, M=None):
+
+    if maxIter is not None and maxIter < 0:
+        raise TypeError('range of maxIter is wrong!')
+
+    if verbose:
+        print('Start BlockCGSolver...')
+
+    if M is None:
+        M = PC.identityPreconditioner()
+
+    countIter = 0
+
+    X = M.apply(B)
+    R = LO.applyOperator(A, X) - B
+    Z = M.apply(R)
+    P = -Z
+    RZ = Z.T @ R
+
+    # the kxk systems become singular once single columns have converged, least squares keeps the step well defined
+    while np.max(np.linalg.norm(R, axis=0)) > delta:
+        if maxIter is not None and countIter >= maxIter:
+            if verbose:
+                print('Warning: maxIter reached, BlockCGSolver did not converge.')
+            break
+        Q = LO.applyOperator(A, P)
+        T = np.linalg.lstsq(P.T @ Q, RZ, rcond=None)[0]
+        X = X + P @ T
+        R = R + Q @ T
+        Z = M.apply(R)
+        RZ_next = Z.T @ R
+        Beta = np.linalg.lstsq(RZ, RZ_next, rcond=None)[0]
+        P = -Z + P @ Beta
+        RZ = RZ_next
+        countIter = countIter + 1
+        if verbose:
+            print('STEP ', countIter, ': maximal norm of residual is ', np.max(np.linalg.norm(R, axis=0)))
+
+    if verbose:
+        print('BlockCGSolver terminated after ', countIter, ' steps with maximal norm of residual being ', np.max(np.linalg.norm(R, axis=0)))
+
+    return X
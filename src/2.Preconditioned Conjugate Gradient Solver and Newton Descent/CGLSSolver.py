@@ -0,0 +1,80 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Conjugate Gradient Least Squares Solver
+
+# Purpose: CGLSSolver finds x minimizing norm(A @ x - b)**2 + alpha * norm(x)**2, such that the residual of the damped
+# normal equations satisfies norm(A.T @ (b - A @ x) - alpha * x) <= delta. A.T @ A is never formed, every step needs
+# one product with A and one with A.T, so the condition number is not squared by forming A.T @ A and changing alpha
+# does not rebuild anything.
+
+# Input Definition:
+# A: real valued matrix mxn (dense or sparse), or matrix free operator with methods .matvec() and .rmatvec()
+# (e.g. linearOperator)
+# b: column vector in R ** m
+# alpha: nonnegative value, damping. Default value: 0.
+# delta: positive value, tolerance for termination. Default value: 1.0e-6.
+# verbose: bool, if set to true, verbose information is displayed
+# maxIter: maximal number of steps. Default value: None (2 * n)
+
+# Output Definition:
+# x: column vector in R ^ n (solution in domain space)
+
+# Required files:
+# y = applyOperator(A, d) from linearOperator.py
+# y = applyTransposedOperator(A, d) from linearOperator.py
+
+# Test cases:
+# A = np.array([[1, 0], [0, 1], [1, 1]], dtype=float)
+# b = np.array([[1], [1], [2]], dtype=float)
+# x = CGLSSolver(A, b, 0, 1.0e-6, 1)
+# should return x = [[1], [1]]
+
+# x = CGLSSolver(A, b, 1, 1.0e-6, 1)
+# should return x = [[0.75], [0.75]]
+
+
+import numpy as np
+import linearOperator as LO
+
+
+def CGLSSolver(A, b: np.array, alpha=0, delta=1.0e-6, verbose=0, maxIter=None):
+
+    if alpha < 0:
+        raise TypeError('range of alpha is wrong!')
+
+    if delta <= 0:
+        raise TypeError('range of delta is wrong!')
+
+    if verbose:
+        print('Start CGLSSolver...')
+
+    countIter = 0
+
+    r = np.array(b, dtype=float)
+    s = LO.applyTransposedOperator(A, r)
+    x = np.zeros(s.shape)
+    if maxIter is None:
+        maxIter = 2 * x.shape[0]
+    d = s.copy()
+    gamma = (s.T @ s).item()
+
+    while np.sqrt(gamma) > delta and countIter < maxIter:
+        q = LO.applyOperator(A, d)
+        rho = (q.T @ q).item() + alpha * (d.T @ d).item()
+        if rho <= 0:
+            print('Warning: curvature vanishes, CGLSSolver cannot be applied reliably.')
+            break
+        t = gamma / rho
+        x = x + t * d
+        r = r - t * q
+        s = LO.applyTransposedOperator(A, r) - alpha * x
+        gammaNext = (s.T @ s).item()
+        d = s + gammaNext / gamma * d
+        gamma = gammaNext
+        countIter = countIter + 1
+        if verbose:
+            print('STEP ', countIter, ': norm of normal equation residual is ', np.sqrt(gamma))
+
+    if verbose:
+        print('CGLSSolver terminated after ', countIter, ' steps with norm of normal equation residual being ', np.sqrt(gamma))
+
+    return x
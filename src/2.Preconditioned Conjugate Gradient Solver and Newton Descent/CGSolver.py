@@ -4,16 +4,17 @@
 # Purpose: CGSolver finds y such that norm(A * y - b) <= delta
 
 # Input Definition:
-# A: real valued spd matrix nxn
-# b: column vector in R ** n
+# A: real valued spd matrix nxn, or matrix free operator with method .matvec() (e.g. linearOperator)
+# b: column vector in R ** n, or matrix in R ** nxk for k right hand sides (solved with BlockCGSolver)
 # delta: positive value, tolerance for termination. Default value: 1.0e-6.
 # verbose: bool, if set to true, verbose information is displayed
 
 # Output Definition:
-# x: column vector in R ^ n (solution in domain space)
+# x: column vector in R ^ n (solution in domain space), or matrix in R ^ nxk for k right hand sides
 
 # Required files:
-# <none>
+# y = applyOperator(A, d) from linearOperator.py
+# X = BlockCGSolver(A, B, delta, verbose) from BlockCGSolver.py
 
 
 # Test cases:
@@ -31,6 +32,8 @@
 
 
 import numpy as np
+import BlockCGSolver as BC
+import linearOperator as LO
 
 
 def CGSolver(A: np.array, b: np.array, delta=1.0e-6, verbose=0):
@@ -38,14 +41,17 @@ def CGSolver(A: np.array, b: np.array, delta=1.0e-6, verbose=0):
     if verbose:
         print('Start CGSolver...')
 
+    if b.ndim == 2 and b.shape[1] > 1:
+        return BC.BlockCGSolver(A, b, delta, verbose)
+
     countIter = 0
 
     x = b
-    r = A @ x - b
+    r = LO.applyOperator(A, x) - b
     d = -r.copy()
 
     while np.linalg.norm(r) > delta:
-        AD = A @ d
+        AD = LO.applyOperator(A, d)
         rho = d.T @ AD
         if np.abs(rho) < delta ** 2:
             print('Warning: curvature vanishes, CGSolver cannot be applied reliably.')
@@ -4,18 +4,33 @@
 # Purpose: Find xmin to satisfy norm(gradf(xmin))<=eps
 # Iteration: x_k = x_k + d_k
 # d_k is the Newton direction
+# In the inexact mode x_k = x_k + t_k * d_k, d_k is a truncated CG solution of the Newton system with relative
+# residual eta_k (Eisenstat-Walker forcing) and t_k results from Armijo backtracking. If backtracking fails, d_k is
+# set to steepest descent, and if that fails too, the descent stops with a warning.
 
 # Input Definition:
 # f: objective class with methods .objective() and .gradient() and .hessian()
 # x0: column vector in R ** n(domain point)
 # eps: tolerance for termination. Default value: 1.0e-3
 # verbose: bool, if set to true, verbose information is displayed
+# matrixFree: bool, if set to true, the Hessian is not formed. The Newton system is solved with Hessian vector products
+# f.hessVec(x, d), or with finite differences of f.gradient() if f has no method .hessVec(). Default value: 0.
+# reuseSteps: nonnegative integer, the incompleteCholesky preconditioner of an earlier Hessian may be reused for up to
+# reuseSteps Newton steps. The same Hessian object is always recognized. Only available for the exact Newton method with
+# explicit Hessian, i.e. matrixFree = 0 and inexact = 0. Default value: 0.
+# inexact: bool, if set to true, the truncated Newton-CG mode is used. Default value: 0.
+# etaMax: value in (0, 1), upper bound of the forcing terms eta_k in the inexact mode. Default value: 0.5.
+# maxIter: positive integer, maximal number of Newton steps. If None, the descent runs until termination. Default value: None.
 
 # Output Definition:
 # xmin: column vector in R ** n(domain point)
 
 # Required files:
 # d = PrecCGSolver(A,b) from PrecCGSolver.py
+# A = linearOperator(matvec, n) from linearOperator.py
+# myCache = preconditionerCache(maxSize, key, reuseSteps) from preconditionerCache.py
+
+# f can be wrapped in cachedObjective(f) from cachedObjective.py to memoize repeated evaluations
 
 # Test cases:
 # myObjective = bananaValleyObjective()
@@ -24,36 +39,169 @@
 # should return
 # xmin close to [[1],[1]]
 
+# xmin = NewtonDescent(myObjective, x0, 1.0e-6, 1, inexact=1)
+# should return
+# xmin close to [[1],[1]]
+
 import numpy as np
 import PrecCGSolver as PCG
+import linearOperator as LO
+import preconditionerCache as PCC
+
+
+def hessianOperator(f, x: np.array, gradx=None, delta=1.0e-6):
+    n = x.shape[0]
+    if hasattr(f, 'hessVec'):
+        return LO.linearOperator(lambda d: f.hessVec(x, d), n, symmetric=1)
+
+    if gradx is None:
+        gradx = f.gradient(x)
+
+    def hessVecApprox(d: np.array):
+        norm_d = np.linalg.norm(d)
+        if norm_d == 0:
+            return np.zeros(d.shape)
+        return norm_d / delta * (f.gradient(x + delta / norm_d * d) - gradx)
 
+    return LO.linearOperator(hessVecApprox, n, symmetric=1)
 
 
-def NewtonDescent(f, x0: np.array, eps=1.0e-3, verbose=0):
+def truncatedCG(B, gradx: np.array, eta, maxIter):
+    # CG for B @ d = -gradx from d = 0 until norm(B @ d + gradx) <= eta * norm(gradx)
+    d = np.zeros(gradx.shape)
+    r = gradx.copy()
+    p = -r
+    rr = r.T @ r
+    tol = eta * np.linalg.norm(gradx)
+    for j in range(maxIter):
+        q = LO.applyOperator(B, p)
+        curvature = p.T @ q
+        if curvature <= 1.0e-12 * (p.T @ p):
+            # negative curvature: use steepest descent in the first step, else the last descent direction
+            if j == 0:
+                return -gradx
+            break
+        t = rr / curvature
+        d = d + t * p
+        r = r + t * q
+        rr_next = r.T @ r
+        if np.sqrt(rr_next) <= tol:
+            break
+        p = -r + rr_next / rr * p
+        rr = rr_next
+
+    return d
+
+
+def armijoStep(f, x: np.array, fx, gradx: np.array, d: np.array, sigma, tMin=1.0e-12):
+    # Armijo backtracking from t = 1, returns t = 0 if no step above tMin gives sufficient decrease
+    descent = gradx.T @ d
+    t = 1
+    while f.objective(x + t * d) > fx + sigma * t * descent:
+        t = 0.5 * t
+        if t <= tMin:
+            return 0
+    return t
+
+
+def truncatedNewtonDescent(f, x0: np.array, eps=1.0e-3, verbose=0, matrixFree=0, etaMax=0.5, sigma=1.0e-4, maxIter=None):
+    countIter = 0
+    x = x0
+    n = x0.shape[0]
+    gamma = 0.9
+    eta = etaMax
+    gradx = f.gradient(x)
+    norm_grad = np.linalg.norm(gradx)
+    while norm_grad > eps:
+        if maxIter is not None and countIter >= maxIter: # stop at the iteration cap
+            print('Warning: maxIter reached, truncated NewtonDescent did not converge.')
+            break
+        countIter += 1
+        if matrixFree:
+            B = hessianOperator(f, x, gradx)
+        else:
+            B = f.hessian(x)
+
+        d = truncatedCG(B, gradx, eta, 2 * n)
+
+        fx = f.objective(x)
+        t = armijoStep(f, x, fx, gradx, d, sigma)
+        if t == 0: # backtracking failed, fall back to steepest descent
+            d = -gradx
+            t = armijoStep(f, x, fx, gradx, d, sigma)
+            if t == 0:
+                print('Warning: Armijo backtracking failed, truncated NewtonDescent stopped.')
+                break
+
+        x = x + t * d
+        gradx = f.gradient(x)
+        norm_old = norm_grad
+        norm_grad = np.linalg.norm(gradx)
+
+        # Eisenstat-Walker forcing term, choice 2 with safeguard
+        eta_next = gamma * (norm_grad / norm_old) ** 2
+        if gamma * eta ** 2 > 0.1:
+            eta_next = max(eta_next, gamma * eta ** 2)
+        eta = min(eta_next, etaMax)
+
+    if verbose:
+        print('truncated NewtonDescent terminated after ', countIter, ' steps with norm of gradient =', norm_grad)
+
+    return x
+
+
+def NewtonDescent(f, x0: np.array, eps=1.0e-3, verbose=0, matrixFree=0, reuseSteps=0, inexact=0, etaMax=0.5, maxIter=None):
 
     if eps <= 0:
         raise TypeError('range of eps is wrong!')
 
+    if etaMax <= 0 or etaMax >= 1:
+        raise TypeError('range of etaMax is wrong!')
+
+    if maxIter is not None and maxIter < 1:
+        raise TypeError('range of maxIter is wrong!')
+
+    if reuseSteps < 0:
+        raise TypeError('range of reuseSteps is wrong!')
+
+    if reuseSteps > 0 and (matrixFree or inexact):
+        raise TypeError('reuseSteps needs matrixFree = 0 and inexact = 0!')
+
     if verbose:
         print('Start NewtonDescent...')
 
+    if inexact:
+        return truncatedNewtonDescent(f, x0, eps, verbose, matrixFree, etaMax, maxIter=maxIter)
+
     countIter = 0
     x = x0
+    myCache = PCC.preconditionerCache(1, 'identity', reuseSteps)
 
     # INCOMPLETE CODE STARTS
     
-    B = f.hessian(x) # store hessian at x
-    while np.linalg.norm(f.gradient(x)) > eps: # iterating until norm of gradient is below eps
+    gradx = f.gradient(x) # store gradient at x, it is evaluated once per step
+    if matrixFree:
+        B = hessianOperator(f, x, gradx) # store hessian vector product at x
+    else:
+        B = f.hessian(x) # store hessian at x
+    while np.linalg.norm(gradx) > eps: # iterating until norm of gradient is below eps
+        if maxIter is not None and countIter >= maxIter: # stop at the iteration cap
+            print('Warning: maxIter reached, NewtonDescent did not converge.')
+            break
         countIter += 1 # increment counter
-        d = -PCG.PrecCGSolver(B, f.gradient(x)) # store direction of steepest descent
+        d = -PCG.PrecCGSolver(B, gradx, cache=myCache) # store direction of steepest descent
         t = 1 # initialize step size
         x = x + t * d # update x with step size t and direction d
-        B = f.hessian(x) # store hessian at new x
+        gradx = f.gradient(x) # store gradient at new x
+        if matrixFree:
+            B = hessianOperator(f, x, gradx) # store hessian vector product at new x
+        else:
+            B = f.hessian(x) # store hessian at new x
         
     # INCOMPLETE CODE ENDS
 
     if verbose:
-        gradx = f.gradient(x)
         print('NewtonDescent terminated after ', countIter, ' steps with norm of gradient =', np.linalg.norm(gradx))
+        print('preconditioner cache: ', myCache.hits, ' hits, ', myCache.staleHits, ' stale hits, ', myCache.misses, ' misses')
 
     return x
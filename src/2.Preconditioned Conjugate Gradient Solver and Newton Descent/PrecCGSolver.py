@@ -2,19 +2,29 @@
 # Preconditioned Conjugate Gradient Solver
 
 # Purpose: PregCGSolver finds y such that norm(A * y - b) <= delta using incompleteCholesky as preconditioner
+# or any preconditioner object M with method .apply()
 
 # Input Definition:
-# A: real valued matrix nxn
-# b: column vector in R ** n
+# A: real valued matrix nxn, or matrix free operator with method .matvec() (e.g. linearOperator)
+# b: column vector in R ** n, or matrix in R ** nxk for k right hand sides (solved with BlockCGSolver)
 # delta: positive value, tolerance for termination. Default value: 1.0e-6.
 # verbose: bool, if set to true, verbose information is displayed
+# maxIter: positive integer, maximal number of CG steps. If None, CG runs until termination. Default value: None.
+# relTol: nonnegative value, tolerance relative to norm(b). Terminates if norm(A * y - b) <= max(delta, relTol * norm(b)).
+# Default value: 0.
+# M: preconditioner object with method .apply(r) returning M^-1 @ r. If None, incompleteCholesky is used for
+# explicit A and no preconditioning for matrix free A. M can also be the name of a preconditioner in
+# preconditionerRegistry, e.g. 'jacobi', 'ssor', 'banded' or 'ichol'. Default value: None.
+# cache: preconditionerCache object. If given and M is None or a name, the preconditioner of A is taken from
+# the cache instead of being recomputed. Default value: None.
 
 # Output Definition:
-# x: column vector in R ^ n(solution in domain space)
+# x: column vector in R ^ n(solution in domain space), or matrix in R ^ nxk for k right hand sides
 
 # Required files:
-# L = incompleteCholesky(A, 1.0e-3, delta) from IncompleteCholesky.py
-# y = LLTSolver(L, r) from LLTSolver.py
+# M = incompleteCholeskyPreconditioner(A), M = makePreconditioner(name, A) from preconditioners.py
+# y = applyOperator(A, d) from linearOperator.py
+# X = BlockCGSolver(A, B, delta, verbose, maxIter, M) from BlockCGSolver.py
 
 # Test cases:
 # A = np.array([[4, 1, 0], [1, 7, 0], [ 0, 0, 3]], dtype=float)
@@ -31,39 +41,70 @@
 
 
 import numpy as np
-import incompleteCholesky as IC
-import LLTSolver as LLT
+import BlockCGSolver as BC
+import linearOperator as LO
+import preconditioners as PC
 
 
-def PrecCGSolver(A: np.array, b: np.array, delta=1.0e-6, verbose=0):
+def PrecCGSolver(A: np.array, b: np.array, delta=1.0e-6, verbose=0, maxIter=None, relTol=0, M=None, cache=None):
+
+    if relTol < 0:
+        raise TypeError('range of relTol is wrong!')
+
+    if maxIter is not None and maxIter < 0:
+        raise TypeError('range of maxIter is wrong!')
 
     if verbose:
         print('Start PrecCGSolver...')
 
     countIter = 0
+    tol = max(delta, relTol * np.linalg.norm(b))
+
+    if isinstance(M, str):
+        if M not in PC.preconditionerRegistry:
+            raise TypeError('unknown preconditioner ' + M + '!')
+        if cache is not None:
+            M = cache.get(A, PC.preconditionerRegistry[M])
+        else:
+            M = PC.preconditionerRegistry[M](A)
+    elif M is None:
+        if LO.isExplicit(A) and cache is not None:
+            M = cache.get(A)
+        elif LO.isExplicit(A):
+            M = PC.incompleteCholeskyPreconditioner(A)
+        else:
+            M = PC.identityPreconditioner()
 
-    L = IC.incompleteCholesky(A)
-    x = LLT.LLTSolver(L, b)
-    r = A @ x - b
+    if b.ndim == 2 and b.shape[1] > 1:
+        return BC.BlockCGSolver(A, b, tol, verbose, maxIter, M)
+
+    x = M.apply(b)
+    r = LO.applyOperator(A, x) - b
     # INCOMPLETE CODE STARTS
-    d = -LLT.LLTSolver(L, r) # store direction of steepest descent
-    
-    while np.linalg.norm(r) > delta: #iterating until norm of residual is below delta
-        q = A @ d   # store q as A @ d
+    z = M.apply(r) # store preconditioned residual
+    d = -z # store direction of steepest descent
+    rz = r.T @ z # store inner product of residual with preconditioned residual
+
+    while np.linalg.norm(r) > tol: #iterating until norm of residual is below tolerance
+        if maxIter is not None and countIter >= maxIter: # stop at the iteration cap
+            if verbose:
+                print('Warning: maxIter reached, PrecCGSolver did not converge.')
+            break
+        q = LO.applyOperator(A, d)   # store q as A @ d
         p = d.T @ q # store p as inner product of d with q
-        t = (r.T @ LLT.LLTSolver(L, r))/p # computing t as step size
+        t = rz / p # computing t as step size
         x = x + t * d # update x with step size and direction
-        r_0 = r # store old residual
         r = r + t * q # update residual
-        beta = (r.T @ LLT.LLTSolver(L, r))/(r_0.T @ LLT.LLTSolver(L, r_0)) # computing conjugate gradient coefficient
-        d = -LLT.LLTSolver(L, r) + beta * d # update direction with beta and new residual
+        z = M.apply(r) # preconditioner is applied once per step
+        rz_next = r.T @ z # store inner product for the new residual
+        beta = rz_next / rz # computing conjugate gradient coefficient
+        d = -z + beta * d # update direction with beta and new residual
+        rz = rz_next # cache inner product for the next step
         countIter += 1 # increment counter
-    
-    x_c = x.copy() # store copy of x after loop termination
-    print("The critical solution is: ", x_c) # print solution
+
     # INCOMPLETE CODE ENDS
 
     if verbose:
         print('precCGSolver terminated after ', countIter, ' steps with norm of residual being ', np.linalg.norm(r))
 
-    return x
\ No newline at end of file
+    return x
@@ -5,17 +5,21 @@
 # eigenvalues are positive and sparsity is preserved
 
 # Input Definition:
-# A: real valued symmetric matrix nxn
+# A: real valued symmetric matrix nxn. Either a dense np.array, a scipy.sparse matrix or a CSR triple
+# (indptr, indices, data). For sparse input only the lower triangle of A is read.
 # alpha: nonnegative scalar, lower bound for eigenvalues of L * L ^ T.Default value: 1.0e-3.
 # delta: scalar, if positive it is tolerance for recognizing nonsparse entry.
 # If negative, do complete cholesky.Default value: 1.0e-6.
 # verbose: bool, if set to true, verbose information is displayed
+# fillLevel: integer, level of fill k of IC(k) for sparse input. 0 keeps the sparsity pattern of A.
+# If negative, fill-in is not limited. Default value: 0.
 
 # Output Definition:
-# A: real valued lower triangle matrix nxn
+# L: real valued lower triangle matrix nxn. Dense input gives a dense np.array, scipy.sparse input
+# gives a scipy.sparse csr matrix and CSR triple input gives a CSR triple (indptr, indices, data).
 
 # Required files:
-# < none >
+# < none >, scipy.sparse is only needed for scipy.sparse input
 
 # Test cases:
 # alpha = 0
@@ -47,11 +51,32 @@
 # should return approximately
 # L = [[2 0 0],[0 2 0], [ 0 0 2]]
 
+# alpha = 1.0e-3
+# delta = 1.0e-6
+# verbose = true
+# A = scipy.sparse.csr_matrix(np.array([[4, 1, 0], [1, 4, 0], [0, 0, 4]], dtype=float))
+# L = incompleteCholesky(A, alpha, delta, verbose)
+# should return a scipy.sparse csr matrix with approximately
+# L.toarray() = [[2 0 0],[0.5 1.94 0], [ 0 0 2]]
+
+import heapq
 import numpy as np
 
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+
+def isSparse(A):
+    return (sp is not None and sp.issparse(A)) or isinstance(A, tuple)
+
+
 
+def incompleteCholesky(A: np.array, alpha=1.0e-3, delta=1.0e-6, verbose=0, fillLevel=0):
+    if isSparse(A):
+        return sparseIncompleteCholesky(A, alpha, delta, verbose, fillLevel)
 
-def incompleteCholesky(A: np.array, alpha=1.0e-3, delta=1.0e-6, verbose=0):
     L = np.copy(A)
     dim = np.shape(L)
     n = dim[0]
@@ -96,3 +121,109 @@ def incompleteCholesky(A: np.array, alpha=1.0e-3, delta=1.0e-6, verbose=0):
         print(residual)
 
     return L
+
+
+def sparseIncompleteCholesky(A, alpha=1.0e-3, delta=1.0e-6, verbose=0, fillLevel=0):
+    isScipy = not isinstance(A, tuple)
+    if isScipy:
+        A = sp.csr_matrix(A)
+        dim = A.shape
+        if dim[0] != dim[1]:
+            raise ValueError('A has wrong dimension.')
+
+        # only the lower triangle is read, so A may also be given as its lower triangle alone
+        indptr, indices, data = A.indptr, A.indices, A.data
+    else:
+        indptr, indices, data = A
+
+    n = len(indptr) - 1
+
+    if alpha < 0:
+        raise ValueError('range of alpha is wrong!')
+
+    unlimitedFill = fillLevel < 0 or delta < 0
+    if delta < 0:
+        print('Warning: negative delta detected, sparsity is not preserved.')
+
+    if verbose:
+        print('Start sparseIncompleteCholesky...')
+
+    # columns of L computed so far, every column k holds rows j > k with value L[j, k] and its fill level
+    colRows = [[] for _ in range(n)]
+    colValues = [[] for _ in range(n)]
+    colLevels = [[] for _ in range(n)]
+    diagL = np.zeros(n)
+    sqrt_alpha = np.sqrt(alpha)
+
+    Lindptr = np.zeros(n + 1, dtype=np.int64)
+    Lindices = []
+    Ldata = []
+    for i in range(n):
+        w = {}
+        level = {}
+        diag = 0.0
+        for idx in range(indptr[i], indptr[i + 1]):
+            j = indices[idx]
+            if j < i:
+                w[j] = w.get(j, 0.0) + data[idx]
+                level[j] = 0
+            elif j == i:
+                diag += data[idx]
+
+        # row i is eliminated from left to right, fill-in entries j > k are pushed on the heap on creation
+        heap = list(w)
+        heapq.heapify(heap)
+        rowIndices = []
+        rowData = []
+        while heap:
+            k = heapq.heappop(heap)
+            if np.abs(w[k]) <= delta:
+                continue
+
+            L_ik = w[k] / diagL[k]
+            rowIndices.append(k)
+            rowData.append(L_ik)
+            diag = diag - L_ik ** 2
+            level_ik = level[k]
+            for j, L_jk, level_jk in zip(colRows[k], colValues[k], colLevels[k]):
+                newLevel = level_ik + level_jk + 1
+                if j in w:
+                    level[j] = min(level[j], newLevel)
+                    w[j] = w[j] - L_ik * L_jk
+                elif unlimitedFill or newLevel <= fillLevel:
+                    w[j] = -L_ik * L_jk
+                    level[j] = newLevel
+                    heapq.heappush(heap, j)
+
+        if diag > alpha:
+            diagL[i] = np.sqrt(diag)
+        else:
+            diagL[i] = sqrt_alpha
+
+        for k, L_ik in zip(rowIndices, rowData):
+            colRows[k].append(i)
+            colValues[k].append(L_ik)
+            colLevels[k].append(level[k])
+
+        Lindices.extend(rowIndices)
+        Lindices.append(i)
+        Ldata.extend(rowData)
+        Ldata.append(diagL[i])
+        Lindptr[i + 1] = len(Lindices)
+
+    Lindices = np.array(Lindices, dtype=np.int64)
+    Ldata = np.array(Ldata, dtype=float)
+
+    if isScipy:
+        L = sp.csr_matrix((Ldata, Lindices, Lindptr), shape=(n, n))
+    else:
+        L = (Lindptr, Lindices, Ldata)
+
+    if verbose:
+        print('sparseIncompleteCholesky terminated with ', Lindptr[-1], ' nonzero entries in L')
+        if isScipy:
+            residual = np.abs(A - L @ L.T).max()
+            print('norm of residual:')
+            print(residual)
+
+    return L
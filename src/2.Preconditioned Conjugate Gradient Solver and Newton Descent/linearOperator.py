@@ -0,0 +1,79 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# linear operator
+
+# Purpose: linearOperator wraps a matrix vector product d -> A @ d, so that solvers can be used without forming A.
+# applyOperator(A, d) evaluates A @ d for dense or sparse matrices and for every object with a .matvec() method.
+
+# Class parameters:
+# matvec: function mapping a column vector d in R ** n (or a matrix in R ** nxk) to A @ d
+# shape: integer n or tuple (m, n), dimension of A
+# rmatvec: function mapping d to A.T @ d. Default value: None, then A.T @ d is not available unless symmetric is set.
+# symmetric: bool, if set to true, A is square and symmetric and matvec is used for A.T @ d as well. Default value: 0.
+
+# Input Definition:
+# d: column vector in R ** n (or matrix in R ** nxk)
+
+# Output Definition:
+# matvec(): A @ d, also available as linearOperator @ d
+# rmatvec(): A.T @ d
+# T: transposed linearOperator
+
+# Required files:
+# < none >
+
+# Test cases:
+# A = np.array([[4, 1, 0], [1, 7, 0], [0, 0, 3]], dtype=float)
+# myOperator = linearOperator(lambda d: A @ d, 3, symmetric=1)
+# d = np.array([[1], [1], [1]], dtype=float)
+# myOperator @ d should return [[5], [8], [3]]
+# applyOperator(myOperator, d) should return [[5], [8], [3]]
+
+import numpy as np
+
+
+class linearOperator:
+
+    def __init__(self, matvec, shape, rmatvec=None, symmetric=0):
+        if np.isscalar(shape):
+            shape = (int(shape), int(shape))
+        self.shape = tuple(shape)
+        self.matvecFunction = matvec
+        if symmetric:
+            if self.shape[0] != self.shape[1]:
+                raise TypeError('symmetric linearOperator must be square.')
+            if rmatvec is None:
+                rmatvec = matvec
+        self.rmatvecFunction = rmatvec
+
+    def matvec(self, d: np.array):
+        return self.matvecFunction(d)
+
+    def rmatvec(self, d: np.array):
+        if self.rmatvecFunction is None:
+            raise TypeError('linearOperator has no rmatvec.')
+        return self.rmatvecFunction(d)
+
+    def __matmul__(self, d: np.array):
+        return self.matvec(d)
+
+    @property
+    def T(self):
+        if self.rmatvecFunction is None:
+            raise TypeError('linearOperator has no rmatvec.')
+        return linearOperator(self.rmatvecFunction, (self.shape[1], self.shape[0]), self.matvecFunction)
+
+
+def applyOperator(A, d: np.array):
+    if hasattr(A, 'matvec') and not isinstance(A, np.ndarray):
+        return A.matvec(d)
+    return A @ d
+
+
+def applyTransposedOperator(A, d: np.array):
+    if hasattr(A, 'rmatvec') and not isinstance(A, np.ndarray):
+        return A.rmatvec(d)
+    return A.T @ d
+
+
+def isExplicit(A):
+    return isinstance(A, np.ndarray) or (hasattr(A, 'toarray') and hasattr(A, 'tocsr'))
@@ -0,0 +1,117 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# preconditioner cache
+
+# Purpose: preconditionerCache stores built preconditioners, so that repeated solves with the same matrix A
+# do not recompute the factorization. Entries are evicted in least recently used order.
+
+# Class parameters:
+# maxSize: positive integer, maximal number of stored preconditioners. Default value: 4.
+# key: 'identity' or 'fingerprint'. 'identity' recognizes the very same array object, 'fingerprint' hashes the
+# entries of A and also recognizes equal copies and in place changes. Default value: 'identity'.
+# reuseSteps: nonnegative integer, a stale preconditioner of a different A with the same shape may be reused
+# for up to reuseSteps requests before it is rebuilt. Default value: 0.
+
+# Input Definition:
+# A: real valued spd matrix nxn, dense or scipy.sparse
+# builder: function A -> preconditioner object with method .apply(). Default value: incompleteCholeskyPreconditioner.
+
+# Output Definition:
+# get(): preconditioner object for A
+# hits, misses, staleHits: counters of cache lookups
+# clear(): removes all entries
+
+# Required files:
+# M = incompleteCholeskyPreconditioner(A) from preconditioners.py
+
+# Test cases:
+# A = np.array([[4, 1, 0], [1, 7, 0], [0, 0, 3]], dtype=float)
+# myCache = preconditionerCache()
+# M1 = myCache.get(A)
+# M2 = myCache.get(A)
+# should return M1 is M2 with myCache.hits = 1 and myCache.misses = 1
+
+import collections
+import hashlib
+import weakref
+import numpy as np
+import preconditioners as PC
+
+
+class preconditionerCache:
+
+    def __init__(self, maxSize=4, key='identity', reuseSteps=0):
+        if maxSize < 1:
+            raise TypeError('range of maxSize is wrong!')
+
+        if key not in ('identity', 'fingerprint'):
+            raise TypeError('key must be identity or fingerprint!')
+
+        if reuseSteps < 0:
+            raise TypeError('range of reuseSteps is wrong!')
+
+        self.maxSize = maxSize
+        self.key = key
+        self.reuseSteps = reuseSteps
+        self.entries = collections.OrderedDict()
+        self.last = None
+        self.staleCount = 0
+        self.hits = 0
+        self.misses = 0
+        self.staleHits = 0
+
+    def fingerprint(self, A):
+        myHash = hashlib.blake2b(digest_size=16)
+        myHash.update(str((A.shape, A.dtype)).encode())
+        if isinstance(A, np.ndarray):
+            myHash.update(np.ascontiguousarray(A).data)
+        else:
+            A = A.tocsr()
+            for part in (A.indptr, A.indices, A.data):
+                myHash.update(np.ascontiguousarray(part).data)
+        return myHash.digest()
+
+    def lookup(self, A, cacheKey):
+        entry = self.entries.get(cacheKey)
+        if entry is None:
+            return None
+        ref, M = entry
+        if ref is not None and ref() is not A:
+            # id was reused by a new array after the cached one was freed
+            del self.entries[cacheKey]
+            return None
+        self.entries.move_to_end(cacheKey)
+        return M
+
+    def get(self, A, builder=PC.incompleteCholeskyPreconditioner):
+        if self.key == 'identity':
+            cacheKey = (id(A), builder)
+            ref = weakref.ref(A)
+        else:
+            cacheKey = (self.fingerprint(A), builder)
+            ref = None
+
+        M = self.lookup(A, cacheKey)
+        if M is not None:
+            self.hits += 1
+            return M
+
+        if self.last is not None and self.staleCount < self.reuseSteps:
+            lastShape, lastBuilder, lastM = self.last
+            if lastShape == A.shape and lastBuilder is builder:
+                self.staleCount += 1
+                self.staleHits += 1
+                return lastM
+
+        self.misses += 1
+        M = builder(A)
+        self.entries[cacheKey] = (ref, M)
+        if len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+        self.last = (A.shape, builder, M)
+        self.staleCount = 0
+        return M
+
+    def clear(self):
+        self.entries.clear()
+        self.last = None
+        self.staleCount = 0
@@ -0,0 +1,155 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# preconditioners
+
+# Purpose: Preconditioner classes for PrecCGSolver. Every preconditioner M approximates A and provides
+# .apply(r), which returns M^-1 @ r. makePreconditioner(name, A) builds a preconditioner from preconditionerRegistry:
+# 'identity': no preconditioning
+# 'ichol': incomplete Cholesky, M = L @ L.T
+# 'jacobi': diagonal of A
+# 'ssor': symmetric successive over-relaxation with relaxation factor omega in (0, 2)
+# 'banded': exact Cholesky of a banded A with LAPACK pbtrf
+
+# Class parameters:
+# A: real valued spd matrix nxn, dense or scipy.sparse (not needed for identityPreconditioner)
+# alpha, delta: parameters of incompleteCholesky. Default values: 1.0e-3 and 1.0e-6.
+# omega: value in (0, 2), relaxation factor of ssorPreconditioner. Default value: 1.0.
+# bandwidth: nonnegative integer, number of subdiagonals of A for bandedCholeskyPreconditioner.
+# If None, it is read from the nonzero entries of A. Default value: None.
+
+# Input Definition:
+# r: column vector in R ** n (or matrix in R ** nxk)
+
+# Output Definition:
+# apply(): M^-1 @ r
+
+# Required files:
+# L = incompleteCholesky(A, alpha, delta) from incompleteCholesky.py
+# y = LLTSolver(L, r) from LLTSolver.py
+# scipy.linalg for bandedCholeskyPreconditioner
+
+# Test cases:
+# A = np.array([[4, 1, 0], [1, 4, 0], [0, 0, 4]], dtype=float)
+# myPreconditioner = incompleteCholeskyPreconditioner(A)
+# r = np.array([[5], [5], [4]], dtype=float)
+# myPreconditioner.apply(r) should return [[1], [1], [1]]
+
+# myPreconditioner = makePreconditioner('jacobi', A)
+# myPreconditioner.apply(r) should return [[1.25], [1.25], [1]]
+
+# myPreconditioner = makePreconditioner('banded', A)
+# myPreconditioner.apply(r) should return [[1], [1], [1]]
+
+import numpy as np
+import incompleteCholesky as IC
+import LLTSolver as LLT
+
+try:
+    import scipy.linalg as sl
+    import scipy.sparse as sp
+except ImportError:
+    sl = None
+    sp = None
+
+
+def diagonalOf(A):
+    if isinstance(A, np.ndarray):
+        return np.diag(A).astype(float)
+    return np.asarray(A.diagonal(), dtype=float)
+
+
+class identityPreconditioner:
+
+    def __init__(self, A=None):
+        pass
+
+    def apply(self, r: np.array):
+        return r.copy()
+
+
+class incompleteCholeskyPreconditioner:
+
+    def __init__(self, A, alpha=1.0e-3, delta=1.0e-6):
+        self.L = IC.incompleteCholesky(A, alpha, delta)
+
+    def apply(self, r: np.array):
+        return LLT.LLTSolver(self.L, r)
+
+
+class jacobiPreconditioner:
+
+    def __init__(self, A):
+        diag = np.abs(diagonalOf(A))
+        diag[diag == 0] = 1
+        self.invDiag = (1 / diag).reshape((-1, 1))
+
+    def apply(self, r: np.array):
+        if r.ndim == 1:
+            return self.invDiag[:, 0] * r
+        return self.invDiag * r
+
+
+class ssorPreconditioner:
+
+    def __init__(self, A, omega=1.0):
+        if omega <= 0 or omega >= 2:
+            raise TypeError('range of omega is wrong!')
+
+        diag = diagonalOf(A)
+        if np.min(diag) <= 0:
+            raise ValueError('ssorPreconditioner needs a positive diagonal.')
+
+        # M = omega/(2-omega) * (D/omega + L) @ (D/omega)^-1 @ (D/omega + L).T = K @ K.T with lower triangle K
+        c = np.sqrt(omega / (2 - omega))
+        colScale = c * np.sqrt(omega / diag)
+        if isinstance(A, np.ndarray):
+            K = np.tril(A, -1) * colScale
+            K[np.diag_indices_from(K)] = c * np.sqrt(diag / omega)
+        else:
+            K = sp.tril(A, -1, format='csr') @ sp.diags(colScale) + sp.diags(c * np.sqrt(diag / omega))
+            K = sp.csr_matrix(K)
+        self.K = K
+
+    def apply(self, r: np.array):
+        return LLT.LLTSolver(self.K, r)
+
+
+class bandedCholeskyPreconditioner:
+
+    def __init__(self, A, bandwidth=None):
+        if sl is None:
+            raise ImportError('bandedCholeskyPreconditioner requires scipy.')
+
+        n = A.shape[0]
+        if isinstance(A, np.ndarray):
+            rows, cols = np.nonzero(np.tril(A))
+            values = A[rows, cols]
+        else:
+            lower = sp.tril(A, format='coo')
+            rows, cols, values = lower.row, lower.col, lower.data
+
+        if bandwidth is None:
+            bandwidth = int(np.max(rows - cols)) if rows.size > 0 else 0
+
+        inBand = rows - cols <= bandwidth
+        # lower banded storage of LAPACK: ab[i - j, j] = A[i, j]
+        ab = np.zeros((bandwidth + 1, n))
+        ab[rows[inBand] - cols[inBand], cols[inBand]] = values[inBand]
+        self.cb = sl.cholesky_banded(ab, lower=True, check_finite=False)
+
+    def apply(self, r: np.array):
+        return sl.cho_solve_banded((self.cb, True), r, check_finite=False)
+
+
+preconditionerRegistry = {
+    'identity': identityPreconditioner,
+    'ichol': incompleteCholeskyPreconditioner,
+    'jacobi': jacobiPreconditioner,
+    'ssor': ssorPreconditioner,
+    'banded': bandedCholeskyPreconditioner,
+}
+
+
+def makePreconditioner(name: str, A, **kwargs):
+    if name not in preconditionerRegistry:
+        raise TypeError('unknown preconditioner ' + str(name) + '!')
+    return preconditionerRegistry[name](A, **kwargs)
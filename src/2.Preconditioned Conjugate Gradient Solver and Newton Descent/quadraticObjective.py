@@ -16,6 +16,7 @@
 # objective(): real number, evaluation at x for parameters p
 # gradient(): vector in R**n, evaluation of gradient wrt x
 # hessian(): matrix in R**nxn, evaluation of hessian wrt x
+# objectiveBatch(): row vector in R**1xm, evaluation at the m columns of X in R**nxm in one vectorized call
 
 # Required files:
 # < none >
@@ -48,6 +49,10 @@ class quadraticObjective:
         f = 0.5 * (x.T @ (self.A @ x)) + self.b.T @ x + self.c
         return f
 
+    def objectiveBatch(self, X: np.array):
+        F = 0.5 * np.sum(X * (self.A @ X), axis=0, keepdims=True) + self.b.T @ X + self.c
+        return F
+
     def gradient(self, x: np.array):
         g = self.A @ x + self.b
         return g
@@ -4,19 +4,27 @@
 # Purpose: Find xmin to satisfy norm(gradf(xmin))<=eps
 # Iteration: x_k = x_k + t_k * d_k
 # d_k is the BFGS direction. If a descent direction check fails, d_k is set to steepest descent and the inverse BFGS matrix is reset.
-# t_k results from Wolfe-Powell
+# t_k results from Wolfe-Powell or More-Thuente
+# The inverse BFGS matrix is updated in place with a rank two correction in O(n ** 2).
 
 # Input Definition:
 # f: objective class with methods .objective() and .gradient()
 # x0: column vector in R ** n(domain point)
 # eps: tolerance for termination. Default value: 1.0e-3
 # verbose: bool, if set to true, verbose information is displayed
+# damped: bool, if set to true, Powell damping replaces y by a convex combination of y and B^-1 @ s, such that
+# y.T @ s >= 0.2 * s.T @ B^-1 @ s and the update never has to be skipped. Default value: 0.
+# lineSearch: 'wolfepowell' for WolfePowellSearch or 'morethuente' for the interpolating MoreThuenteSearch, which
+# usually needs fewer evaluations on badly scaled problems. Default value: 'wolfepowell'
 
 # Output Definition:
 # xmin: column vector in R ** n(domain point)
 
 # Required files:
 # t = WolfePowellSearch(f, x, d) from WolfePowellSearch.py
+# t = MoreThuenteSearch(f, x, d) from MoreThuenteSearch.py
+
+# f can be wrapped in cachedObjective(f) from cachedObjective.py to memoize repeated evaluations
 
 # Test cases:
 # myObjective = noHessianObjective()
@@ -28,13 +36,42 @@
 
 import numpy as np
 import WolfePowellSearch as WP
-
-
-
-def BFGSDescent(f, x0: np.array, eps=1.0e-3, verbose=0):
+import MoreThuenteSearch as MT
+
+try:
+    from scipy.linalg.blas import dger
+except ImportError:
+    dger = None
+
+
+def BFGSUpdate(B: np.array, s: np.array, y: np.array):
+    # B = (E - rho*s@y.T) @ B @ (E - rho*y@s.T) + rho*s@s.T written as B + s@u.T + By@v.T
+    rho = 1 / (y.T @ s).item()
+    By = B @ y
+    c = rho + rho ** 2 * (y.T @ By).item()
+    u = c * s - rho * By
+    v = -rho * s
+    if dger is not None and B.flags.c_contiguous and B.dtype == np.float64:
+        # B is symmetric, so its transpose is a Fortran ordered view that BLAS can update in place
+        dger(1.0, s[:, 0], u[:, 0], a=B.T, overwrite_a=1)
+        dger(1.0, By[:, 0], v[:, 0], a=B.T, overwrite_a=1)
+    else:
+        B += s @ u.T
+        B += By @ v.T
+    return B
+
+
+def BFGSDescent(f, x0: np.array, eps=1.0e-3, verbose=0, damped=0, lineSearch='wolfepowell'):
     if eps <= 0:
         raise TypeError('range of eps is wrong!')
 
+    if lineSearch == 'wolfepowell':
+        search = WP.WolfePowellSearch
+    elif lineSearch == 'morethuente':
+        search = MT.MoreThuenteSearch
+    else:
+        raise TypeError('unknown lineSearch!')
+
     if verbose:
         print('Start BFGSDescent...')
 
@@ -42,44 +79,51 @@ def BFGSDescent(f, x0: np.array, eps=1.0e-3, verbose=0):
     x = x0
     n = x0.shape[0]
     E = np.eye(n)
-    B = E
+    B = E.copy()
     # INCOMPLETE CODE STARTS
     
-    while np.linalg.norm(f.gradient(x)) > eps:
+    gradx = f.gradient(x)
+    while np.linalg.norm(gradx) > eps:
         countIter += 1
-        gradx = f.gradient(x)
         d = -B @ gradx
 
         # Step 3b: Check if d is a descent direction
         if d.T @ gradx >= 0:
             d = -gradx
-            B = E
+            B = E.copy()
             if verbose:
                 print("Descent direction check failed. Resetting B to identity matrix.")
 
         # Step 3c: Wolfe-Powell line search
-        t = WP.WolfePowellSearch(f, x, d, 1.0e-3, 1.0e-2, verbose)
+        t = search(f, x, d, 1.0e-3, 1.0e-2, verbose)
 
         # Step 3d: Compute ∆gk and ∆xk
         s = t * d
         x_new = x + s
-        y = f.gradient(x_new) - gradx
+        gradx_new = f.gradient(x_new)
+        y = gradx_new - gradx
+        if damped:
+            Hs = -t * gradx # inverse of B times s, because d = -B @ gradx
+            sHs = (s.T @ Hs).item()
+            ys = (y.T @ s).item()
+            if ys < 0.2 * sHs:
+                theta = 0.8 * sHs / (sHs - ys)
+                y = theta * y + (1 - theta) * Hs
 
         # Step 3e: Update x
         x = x_new
+        gradx = gradx_new
 
         # Step 3f: Check curvature condition and update B
         if y.T @ s <= 0:
-            B = E
+            B = E.copy()
             if verbose:
                 print("Curvature condition failed. Resetting B to identity matrix.")
         else:
-            rho = 1 / (y.T @ s)
-            B = (E - rho * s @ y.T) @ B @ (E - rho * y @ s.T) + rho * s @ s.T
+            B = BFGSUpdate(B, s, y)
 
     # INCOMPLETE CODE ENDS
     if verbose:
-        gradx = f.gradient(x)
         print('BFGSDescent terminated after ', countIter, ' steps with norm of gradient =', np.linalg.norm(gradx), 'and the inverse BFGS matrix is')
         print(B)
 
@@ -0,0 +1,109 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# global limited memory BFGS descent
+
+# Purpose: Find xmin to satisfy norm(gradf(xmin))<=eps
+# Iteration: x_k = x_k + t_k * d_k
+# d_k is the L-BFGS direction, computed with the two-loop recursion from the last m pairs (s, y) in O(m*n).
+# If a descent direction check fails, d_k is set to steepest descent and the stored pairs are dropped.
+# t_k results from Wolfe-Powell
+
+# Input Definition:
+# f: objective class with methods .objective() and .gradient()
+# x0: column vector in R ** n(domain point)
+# eps: tolerance for termination. Default value: 1.0e-3
+# verbose: bool, if set to true, verbose information is displayed
+# m: positive integer, number of stored pairs (s, y). Default value: 10
+
+# Output Definition:
+# xmin: column vector in R ** n(domain point)
+
+# Required files:
+# t = WolfePowellSearch(f, x, d) from WolfePowellSearch.py
+
+# Test cases:
+# myObjective = noHessianObjective()
+# x0 = np.array([[-0.01], [0.01]])
+# xmin = LBFGSDescent(myObjective, x0, 1.0e-6, 1, 10)
+# should return
+# xmin close to [[0.26],[-0.21]]
+
+
+import numpy as np
+import WolfePowellSearch as WP
+
+
+def LBFGSDirection(gradx: np.array, S: np.array, Y: np.array, rho: np.array, newest: int, count: int):
+    # two-loop recursion, the pairs are stored in a ring buffer with the newest pair in column newest
+    m = S.shape[1]
+    q = gradx.copy()
+    a = np.zeros(m)
+    order = [(newest - i) % m for i in range(count)]
+    for j in order:
+        a[j] = rho[j] * (S[:, j] @ q[:, 0])
+        q[:, 0] -= a[j] * Y[:, j]
+
+    if count > 0:
+        gamma = 1 / (rho[newest] * (Y[:, newest] @ Y[:, newest]))
+        q = gamma * q
+
+    for j in reversed(order):
+        b = rho[j] * (Y[:, j] @ q[:, 0])
+        q[:, 0] += (a[j] - b) * S[:, j]
+
+    return -q
+
+
+def LBFGSDescent(f, x0: np.array, eps=1.0e-3, verbose=0, m=10):
+    if eps <= 0:
+        raise TypeError('range of eps is wrong!')
+
+    if m < 1:
+        raise TypeError('range of m is wrong!')
+
+    if verbose:
+        print('Start LBFGSDescent...')
+
+    countIter = 0
+    x = x0
+    n = x0.shape[0]
+    S = np.zeros((n, m))
+    Y = np.zeros((n, m))
+    rho = np.zeros(m)
+    newest = -1
+    count = 0
+
+    gradx = f.gradient(x)
+    while np.linalg.norm(gradx) > eps:
+        countIter += 1
+        d = LBFGSDirection(gradx, S, Y, rho, newest, count)
+
+        if d.T @ gradx >= 0:
+            d = -gradx
+            count = 0
+            if verbose:
+                print("Descent direction check failed. Dropping stored pairs.")
+
+        t = WP.WolfePowellSearch(f, x, d, 1.0e-3, 1.0e-2, verbose)
+
+        s = t * d
+        x = x + s
+        gradx_new = f.gradient(x)
+        y = gradx_new - gradx
+        gradx = gradx_new
+
+        ys = (y.T @ s).item()
+        if ys <= 0:
+            count = 0
+            if verbose:
+                print("Curvature condition failed. Dropping stored pairs.")
+        else:
+            newest = (newest + 1) % m
+            S[:, newest] = s[:, 0]
+            Y[:, newest] = y[:, 0]
+            rho[newest] = 1 / ys
+            count = min(count + 1, m)
+
+    if verbose:
+        print('LBFGSDescent terminated after ', countIter, ' steps with norm of gradient =', np.linalg.norm(gradx))
+
+    return x
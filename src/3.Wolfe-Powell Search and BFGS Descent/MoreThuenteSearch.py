@@ -0,0 +1,240 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# More-Thuente line search
+
+# Purpose: Find t to satisfy f(x+t*d)<=f(x) + t*sigma*gradf(x).T@d and gradf(x+t*d).T@d >= rho*gradf(x).T@d
+# Instead of doubling, halving and bisection, trial steps are chosen by safeguarded cubic and quadratic interpolation
+# of the values and slopes phi(t) = f(x+t*d) and phi'(t) = gradf(x+t*d).T@d at the end points of the bracket.
+
+# Input Definition:
+# f: objective class with methods .objective() and .gradient(). If f has a method .objectiveAndGradient() returning
+# [objective, gradient], it is used instead, so value and gradient of a trial point are computed in one call.
+# x: column vector in R ** n(domain point)
+# d: column vector in R ** n(search direction)
+# sigma: value in (0, 1 / 2), marks quality of decrease. Default value: 1.0e-3
+# rho: value in (sigma, 1), marks quality of steepness. Default value: 1.0e-2
+# verbose: bool, if set to true, verbose information is displayed
+# strong: bool, if set to true, the strong condition abs(gradf(x+t*d).T@d) <= -rho*gradf(x).T@d is used. Default value: 0
+# maxEval: maximal number of trial points. Default value: 30
+# tMax: upper bound for t. Default value: 1.0e10
+
+# Output Definition:
+# t: t is set, such that t satisfies both Wolfe - Powell conditions. If the search stops early due to maxEval or
+# rounding errors, the best step found so far is returned, which satisfies the first Wolfe - Powell condition if any
+# such step was found.
+
+# Required files:
+# < none >
+
+# Test cases:
+# p = np.array([[0], [1]])
+# myObjective = simpleValleyObjective(p)
+# x = np.array([[-1.01], [1]])
+# d = np.array([[1], [1]])
+# t = MoreThuenteSearch(myObjective, x, d, 1.0e-3, 1.0e-2, 1)
+# should return t=1
+
+# myObjective = bananaValleyObjective()
+# x0 = np.array([[0], [1]])
+# xmin = BFGSDescent(myObjective, x0, 1.0e-6, 1, lineSearch='morethuente')
+# should return xmin close to [[1],[1]] with fewer objective evaluations than with WolfePowellSearch
+
+import numpy as np
+
+
+def interpolationStep(stx, fx, dx, sty, fy, dy, stp, fp, dp, bracket, tMin, tMax):
+    # one safeguarded step of More and Thuente, stx is the best step so far, sty the other end of the interval
+    sgnd = dp * np.sign(dx)
+
+    if fp > fx: # higher function value, the minimizer is bracketed, take cubic step or mean of cubic and quadratic
+        theta = 3 * (fx - fp) / (stp - stx) + dx + dp
+        s = max(abs(theta), abs(dx), abs(dp))
+        gamma = s * np.sqrt(max(0.0, (theta / s) ** 2 - (dx / s) * (dp / s)))
+        if stp < stx:
+            gamma = -gamma
+        p = (gamma - dx) + theta
+        q = ((gamma - dx) + gamma) + dp
+        stpc = stx + p / q * (stp - stx)
+        stpq = stx + dx / ((fx - fp) / (stp - stx) + dx) / 2 * (stp - stx)
+        if abs(stpc - stx) <= abs(stpq - stx):
+            stpf = stpc
+        else:
+            stpf = stpc + (stpq - stpc) / 2
+        bracket = 1
+
+    elif sgnd < 0: # lower function value and slopes of opposite sign, take the step farther from stp
+        theta = 3 * (fx - fp) / (stp - stx) + dx + dp
+        s = max(abs(theta), abs(dx), abs(dp))
+        gamma = s * np.sqrt(max(0.0, (theta / s) ** 2 - (dx / s) * (dp / s)))
+        if stp > stx:
+            gamma = -gamma
+        p = (gamma - dp) + theta
+        q = ((gamma - dp) + gamma) + dx
+        stpc = stp + p / q * (stx - stp)
+        stpq = stp + dp / (dp - dx) * (stx - stp)
+        if abs(stpc - stp) > abs(stpq - stp):
+            stpf = stpc
+        else:
+            stpf = stpq
+        bracket = 1
+
+    elif abs(dp) < abs(dx): # lower function value, same slope sign and decreasing slope magnitude
+        theta = 3 * (fx - fp) / (stp - stx) + dx + dp
+        s = max(abs(theta), abs(dx), abs(dp))
+        gamma = s * np.sqrt(max(0.0, (theta / s) ** 2 - (dx / s) * (dp / s)))
+        if stp > stx:
+            gamma = -gamma
+        p = (gamma - dp) + theta
+        q = (gamma + (dx - dp)) + gamma
+        r = p / q
+        if r < 0 and gamma != 0:
+            stpc = stp + r * (stx - stp)
+        elif stp > stx:
+            stpc = tMax
+        else:
+            stpc = tMin
+        stpq = stp + dp / (dp - dx) * (stx - stp)
+        if bracket:
+            if abs(stpc - stp) < abs(stpq - stp):
+                stpf = stpc
+            else:
+                stpf = stpq
+            if stp > stx:
+                stpf = min(stp + 0.66 * (sty - stp), stpf)
+            else:
+                stpf = max(stp + 0.66 * (sty - stp), stpf)
+        else:
+            if abs(stpc - stp) > abs(stpq - stp):
+                stpf = stpc
+            else:
+                stpf = stpq
+            stpf = min(max(stpf, tMin), tMax)
+
+    else: # lower function value, same slope sign and no decrease of slope magnitude
+        if bracket:
+            theta = 3 * (fp - fy) / (sty - stp) + dy + dp
+            s = max(abs(theta), abs(dy), abs(dp))
+            gamma = s * np.sqrt(max(0.0, (theta / s) ** 2 - (dy / s) * (dp / s)))
+            if stp > sty:
+                gamma = -gamma
+            p = (gamma - dp) + theta
+            q = ((gamma - dp) + gamma) + dy
+            stpf = stp + p / q * (sty - stp)
+        elif stp > stx:
+            stpf = tMax
+        else:
+            stpf = tMin
+
+    # update the interval of uncertainty
+    if fp > fx:
+        sty, fy, dy = stp, fp, dp
+    else:
+        if sgnd < 0:
+            sty, fy, dy = stx, fx, dx
+        stx, fx, dx = stp, fp, dp
+
+    return [stx, fx, dx, sty, fy, dy, stpf, bracket]
+
+
+def MoreThuenteSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, verbose=0, strong=0, maxEval=30, tMax=1.0e10):
+    fused = hasattr(f, 'objectiveAndGradient')
+    if fused:
+        fx, gradx = f.objectiveAndGradient(x)
+    else:
+        fx = f.objective(x)
+        gradx = f.gradient(x)
+    descent = (gradx.T @ d).item()
+
+    if descent >= 0:
+        raise TypeError('descent direction check failed!')
+
+    if sigma <= 0 or sigma >= 0.5:
+        raise TypeError('range of sigma is wrong!')
+
+    if rho <= sigma or rho >= 1:
+        raise TypeError('range of rho is wrong!')
+
+    if maxEval < 1:
+        raise TypeError('range of maxEval is wrong!')
+
+    if verbose:
+        print('Start MoreThuenteSearch...')
+
+    def phi(t): # value and slope of f along d
+        xt = x + t * d
+        if fused:
+            ft, gradft = f.objectiveAndGradient(xt)
+        else:
+            ft = f.objective(xt)
+            gradft = f.gradient(xt)
+        return [np.asarray(ft).item(), (gradft.T @ d).item()]
+
+    f0 = np.asarray(fx).item()
+    xTol = 1.0e-10
+    t = min(1.0, tMax)
+    stx, fstx, dstx = 0.0, f0, descent
+    sty, fsty, dsty = 0.0, f0, descent
+    tLow = 0.0
+    tHigh = t + 4 * t
+    width = tMax
+    width1 = 2 * width
+    bracket = 0
+    stage = 1
+    countEval = 0
+    converged = 0
+    reason = 'maximal number of evaluations reached'
+
+    while countEval < maxEval:
+        ft, dt = phi(t)
+        countEval += 1
+        ftest = f0 + t * sigma * descent
+
+        if ft <= ftest and (abs(dt) <= -rho * descent if strong else dt >= rho * descent):
+            converged = 1
+            break
+        if bracket and (t <= tLow or t >= tHigh):
+            reason = 'rounding errors prevent progress'
+            break
+        if bracket and tHigh - tLow <= xTol * tHigh:
+            reason = 'interval of uncertainty below tolerance'
+            break
+        if t == tMax and ft <= ftest and dt <= sigma * descent:
+            reason = 'step is at upper bound tMax'
+            break
+
+        if stage == 1 and ft <= ftest and dt >= min(sigma, rho) * descent and dt >= 0:
+            stage = 2
+
+        if stage == 1 and fstx >= ft > ftest:
+            # use the modified function psi(t) = phi(t) - phi(0) - t*sigma*phi'(0) until a step with phi(t) <= ftest is found
+            g = sigma * descent
+            stx, fm, dm, sty, fym, dym, t, bracket = interpolationStep(stx, fstx - stx * g, dstx - g, sty, fsty - sty * g, dsty - g, t, ft - t * g, dt - g, bracket, tLow, tHigh)
+            fstx, dstx = fm + stx * g, dm + g
+            fsty, dsty = fym + sty * g, dym + g
+        else:
+            stx, fstx, dstx, sty, fsty, dsty, t, bracket = interpolationStep(stx, fstx, dstx, sty, fsty, dsty, t, ft, dt, bracket, tLow, tHigh)
+
+        if bracket:
+            if abs(sty - stx) >= 0.66 * width1: # force sufficient shrinking of the interval by bisection
+                t = stx + 0.5 * (sty - stx)
+            width1 = width
+            width = abs(sty - stx)
+            tLow, tHigh = min(stx, sty), max(stx, sty)
+        else:
+            tLow = t + 1.1 * (t - stx)
+            tHigh = t + 4 * (t - stx)
+
+        t = min(max(t, 0.0), tMax)
+        if bracket and (t <= tLow or t >= tHigh or tHigh - tLow <= xTol * tHigh):
+            t = stx
+
+    if not converged and stx > 0:
+        t, ft = stx, fstx
+
+    if verbose:
+        if converged:
+            print('MoreThuenteSearch terminated after ', countEval, ' evaluations with t=', t)
+        else:
+            print('MoreThuenteSearch stopped after ', countEval, ' evaluations (', reason, ') with t=', t)
+        print('Wolfe-Powell: ', ft, '<=', f0 + t * sigma * descent, ' and ', dt if converged else '(not checked)', '>=', rho * descent)
+
+    return t
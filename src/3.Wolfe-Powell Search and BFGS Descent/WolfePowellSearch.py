@@ -4,19 +4,24 @@
 # Purpose: Find t to satisfy f(x+t*d)<=f(x) + t*sigma*gradf(x).T@d and gradf(x+t*d).T@d >= rho*gradf(x).T@d
 
 # Input Definition:
-# f: objective class with methods .objective() and .gradient()
+# f: objective class with methods .objective() and .gradient(). If f has a method .objectiveAndGradient() returning
+# [objective, gradient], it is used instead, so value and gradient of a trial point are computed in one call.
 # x: column vector in R ** n(domain point)
 # d: column vector in R ** n(search direction)
 # sigma: value in (0, 1 / 2), marks quality of decrease. Default value: 1.0e-3
 # rho: value in (sigma, 1), marks quality of steepness. Default value: 1.0e-2
 # verbose: bool, if set to true, verbose information is displayed
+# maxEval: maximal number of trial points, guards the tracking loops against cycling forever. Default value: 100
 
 # Output Definition:
-# t: t is set, such that t satisfies both Wolfe - Powell conditions
+# t: t is set, such that t satisfies both Wolfe - Powell conditions. If maxEval is reached, the last step satisfying
+# the first Wolfe - Powell condition is returned, or the last trial step if there is none.
 
 # Required files:
 # < none >
 
+# Every trial point x + t*d is evaluated at most once, repeated checks of the same t are served from a cache.
+
 # Test cases:
 # p = np.array([[0], [1]])
 # myObjective = simpleValleyObjective(p)
@@ -48,9 +53,13 @@
 import numpy as np
 
 
-def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, verbose=0):
-    fx = f.objective(x)
-    gradx = f.gradient(x)
+def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, verbose=0, maxEval=100):
+    fused = hasattr(f, 'objectiveAndGradient')
+    if fused:
+        fx, gradx = f.objectiveAndGradient(x)
+    else:
+        fx = f.objective(x)
+        gradx = f.gradient(x)
     descent = gradx.T @ d
 
     if descent >= 0:
@@ -62,6 +71,9 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
     if rho <= sigma or rho >= 1:
         raise TypeError('range of rho is wrong!')
 
+    if maxEval < 1:
+        raise TypeError('range of maxEval is wrong!')
+
     if verbose:
         print('Start WolfePowellSearch...')
 
@@ -73,17 +85,34 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
         isWP2 = gradft.T @ d >= rho*descent
         return isWP2
 
+    trials = {}
+
+    def evaluate(t, key): # evaluate objective or gradient at x + t*d once and cache it
+        entry = trials.setdefault(t, {})
+        if key not in entry:
+            xt = x + t * d
+            if fused:
+                entry['objective'], entry['gradient'] = f.objectiveAndGradient(xt)
+            elif key == 'objective':
+                entry['objective'] = f.objective(xt)
+            else:
+                entry['gradient'] = f.gradient(xt)
+        return entry[key]
+
+    def budget(): # True while new trial points may be evaluated
+        return len(trials) < maxEval
+
     t = 1
     # INCOMPLETE CODE STARTS
 
     def w1(t): # function to check Wolfe condition 1
-        return f.objective(x + t * d) <= fx + t * sigma * descent # check Wolfe condition 1
+        return evaluate(t, 'objective') <= fx + t * sigma * descent # check Wolfe condition 1
     def w2(t): # function to check Wolfe condition 2
-        return f.gradient(x + t * d).T @ d >= rho * descent # check Wolfe condition 2
+        return evaluate(t, 'gradient').T @ d >= rho * descent # check Wolfe condition 2
     
     if not w1(t): # if Wolfe condition 1 is not satisfied backtracking
         t = 0.5 * t # reduce step size
-        while not w1(t): # while Wolfe condition 1 is still not satisfied
+        while not w1(t) and budget(): # while Wolfe condition 1 is still not satisfied
             t = 0.5 * t # again reduce step size 
         t_ = t # store t minus as new step size
         tp = 2 * t  # set t plus as double of t
@@ -93,14 +122,14 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
 
     else: # if Wolfe condition 1 is satisfied and Wolfe condition 2 is not satisfied fronttracking
         t = 2 * t # increase step size
-        while w1(t): # while Wolfe condition 1 is satisfied
+        while w1(t) and budget(): # while Wolfe condition 1 is satisfied
             t = 2 * t # increase step size
         t_ = t * 0.5 # store t minus as new step size 
         tp = t # set t plus as t
 
     t = t_ # set t as t minus
 
-    while not w2(t): # while Wolfe condition 2 is not satisfied
+    while not w2(t) and budget(): # while Wolfe condition 2 is not satisfied
         t = 0.5 * (t_ + tp) # set t as average of t minus and t plus
         if w1(t): # if Wolfe condition 1 is satisfied
             t_ = t # set t minus as t
@@ -109,10 +138,15 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
 
     # INCOMPLETE CODE ENDS
 
+    if not budget() and not (w1(t) and w2(t)):
+        if w1(t_):
+            t = t_
+        if verbose:
+            print('WolfePowellSearch reached maxEval =', maxEval, 'trial points without satisfying both conditions.')
+
     if verbose:
-        xt = x + t * d
-        fxt = f.objective(xt)
-        gradxt = f.gradient(xt)
+        fxt = evaluate(t, 'objective')
+        gradxt = evaluate(t, 'gradient')
         print('WolfePowellSearch terminated with t=', t)
         print('Wolfe-Powell: ', fxt, '<=', fx+t*sigma*descent, ' and ', gradxt.T @ d, '>=', rho*descent)
 
@@ -20,6 +20,7 @@ class bananaValleyObjective:
     # objective: real number, evaluation at x
     # gradient: vector in R**2, evaluation of gradient wrt x
     # hessian: matrix in R**2x2, evaluation of hessian wrt x
+    # objectiveBatch: row vector in R**1xm, evaluation at the m columns of X in R**2xm
 
     # Test cases:
     # myObjective = bananaValleyObjective.objective(np.array([[1],[1]], dtype=float))
@@ -39,6 +40,11 @@ class bananaValleyObjective:
         y = 100*(x[1,0]-x[0,0]**2)**2+(1-x[0,0])**2+2
         return y
 
+    @staticmethod
+    def objectiveBatch(X: np.array):
+        Y = 100*(X[1:2, :]-X[0:1, :]**2)**2+(1-X[0:1, :])**2+2
+        return Y
+
     @staticmethod
     def gradient(x: np.array):
         f_dx1 = -400 * (x[1,0] - x[0,0] ** 2) * x[0,0] - 2 * (1 - x[0,0])
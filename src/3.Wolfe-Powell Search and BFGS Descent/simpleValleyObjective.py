@@ -17,6 +17,8 @@
 # hessian: matrix in R**2x2, evaluation of hessian wrt x
 # setParameters(): sets p
 # parameterGradient(): vector in R**2, evaluation of gradient wrt p
+# objectiveBatch(): row vector in R**1xm, evaluation at the m columns of X in R**2xm
+# parameterJacobian(): matrix in R**mx2, k-th row is the gradient wrt p at the k-th column of X in R**2xm
 
 # Required files:
 # < none >
@@ -53,6 +55,10 @@ class simpleValleyObjective:
         f = np.cosh(x0) + p0*(x1-1)**2 + p1
         return f
 
+    def objectiveBatch(self, X: np.array):
+        F = np.cosh(X[0:1, :]) + self.p[0, 0]*(X[1:2, :]-1)**2 + self.p[1, 0]
+        return F
+
     def gradient(self, x: np.array):
         p0 = self.p[0, 0]
         x0 = x[0, 0]
@@ -79,3 +85,9 @@ class simpleValleyObjective:
         myGradP = np.array([[(x[1, 0] - 1)**2], [1]], dtype=float)
 
         return myGradP
+
+    @staticmethod
+    def parameterJacobian(X: np.array):
+        myJacobianP = np.column_stack([(X[1, :] - 1)**2, np.ones(X.shape[1])]).astype(float)
+
+        return myJacobianP
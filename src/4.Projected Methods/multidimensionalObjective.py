@@ -22,6 +22,8 @@ class multidimensionalObjective:
     # Output Definition:
     # objective: real number, evaluation of nonlinearObjective at x
     # gradient: real column vector in R**8, evaluation of the gradient with respect to x at x
+    # objectiveAndGradient: [objective, gradient] at x, sharing A @ x between both
+    # objectiveBatch: row vector in R**1xm, evaluation at the m columns of X in R**8xm
     # hessian: real 8x8 matrix, evaluation of the hessian with respect to x at x
     # setParameters(): sets p
     # parameterGradient(): vector in R**1, evaluation of gradient wrt p
@@ -47,6 +49,20 @@ class multidimensionalObjective:
         g = self.A @ x - self.b - self.p / (tau ** 2) * (self.A @ x)
         return g
 
+    def objectiveBatch(self, X: np.array):
+        xAx = np.sum(X * (self.A @ X), axis=0, keepdims=True)
+        tau = 0.5 * xAx + 1
+        value = 0.5 * xAx - self.b.T @ X + self.p / tau
+        return value
+
+    def objectiveAndGradient(self, x: np.array):
+        Ax = self.A @ x
+        xAx = x.T @ Ax
+        tau = 0.5 * xAx + 1
+        value = 0.5 * xAx - self.b.T @ x + self.p / tau
+        g = Ax - self.b - self.p / (tau ** 2) * Ax
+        return [value, g]
+
     def hessian(self, x: np.array):
         tau = 0.5 * x.T @ self.A @ x + 1
         h = self.A - self.p / (tau ** 2) * self.A + (2*self.p) / (tau ** 3) * (self.A @ x) @ (self.A @ x).T
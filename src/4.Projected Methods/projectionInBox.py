@@ -10,11 +10,14 @@
 
 # Input Definition:
 # x: column vector in R ** n(domain space)
+# out: optional column vector in R ** n, project(x, out) writes projectedX into out, out=x projects in place
+# mask: bool, if set to true, activeIndexSet(x, 1) returns a boolean mask instead of indices. Default value: 0
 
 # Output Definition:
 # projectedX: column vector in R ** n, satisfies box constraints
-# activeIndexSet: list of indices, collected indices mark x[i, 0] components with projectedX[i, 0]-a[i, 0] <= eps
-# or projectedX[i, 0] - b[i, 0] >= -eps
+# activeIndexSet: index array, collected indices mark x[i, 0] components with projectedX[i, 0]-a[i, 0] <= eps
+# or projectedX[i, 0] - b[i, 0] >= -eps. With mask set, a boolean array in R ** n being true at these indices.
+# Both are computed in one vectorized pass.
 
 # Required files:
 # < none >
@@ -48,23 +51,15 @@ class projectionInBox:
         if np.min(b - a) < eps:
             raise TypeError('a and b forming box is degenerate.')
         
-    def project(self, x: np.array):
-        n = x.shape[0]
-        projectedX = x.copy()
-        for i in range(n):
-            if x[i, 0] < self.a[i, 0]:
-                projectedX[i, 0] = self.a[i, 0]
-          
-            if x[i, 0] > self.b[i, 0]:
-                projectedX[i, 0] = self.b[i, 0]
-                
+    def project(self, x: np.array, out=None):
+        n = x.shape[0] # bounds may be longer than x, only the first n entries apply
+        projectedX = np.clip(x, self.a[:n], self.b[:n], out=out)
         return projectedX
     
-    def activeIndexSet(self, x: np.array):
+    def activeIndexSet(self, x: np.array, mask=0):
         n = x.shape[0]
-        myList = []
-        for i in range(n):
-            if x[i, 0] <= self.a[i, 0]+self.eps or x[i, 0] >= self.b[i, 0]-self.eps:
-                myList.append(i)
+        isActive = (x[:, 0] <= self.a[:n, 0] + self.eps) | (x[:, 0] >= self.b[:n, 0] - self.eps)
+        if mask:
+            return isActive
 
-        return myList
+        return np.flatnonzero(isActive)
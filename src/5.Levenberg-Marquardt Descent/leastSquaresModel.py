@@ -5,7 +5,8 @@
 
 # Input Definition:
 # model: objective class with methods .objective() and .gradient() for data evaluation
-# and .setParameters() and .parameterGradient()
+# and .setParameters() and .parameterGradient(). If model has the methods .objectiveBatch() or .parameterJacobian(),
+# residual and jacobian evaluate all measure points in one vectorized call, otherwise point by point.
 # p: column vector in R**m (parameter space)
 # xData: matrix in R**nxN (measure points). xData[:,k].reshape((n,1)) returns the k-th measure point as column vector.
 # fData: row vector in R**1xN (measure results). fData[:,k] returns the k-th measure result as a scalar.
@@ -45,6 +46,10 @@ class leastSquaresModel:
 
         # INCOMPLETE CODE STARTS
 
+        if hasattr(self.model, 'objectiveBatch'):
+            myResidual = (self.model.objectiveBatch(self.xData) - self.fData).T
+            return myResidual
+
         for k in range(self.N): 
             x_k = self.xData[:, k].reshape((-1, 1))  
             myResidual[k] = self.model.objective(x_k) - self.fData[:, k]
@@ -60,6 +65,10 @@ class leastSquaresModel:
 
         # INCOMPLETE CODE STARTS
 
+        if hasattr(self.model, 'parameterJacobian'):
+            myJacobian = self.model.parameterJacobian(self.xData)
+            return myJacobian
+
         for k in range(self.N):  # iterate over all data points
             x_k = self.xData[:, k].reshape((-1, 1))  # extract k-th data point as column vector
             myJacobian[k, :] = self.model.parameterGradient(x_k).T  # compute Jacobian row
@@ -2,20 +2,50 @@
 # Levenberg-Marquardt descent
 
 # Purpose: Find pmin to satisfy norm(jacobian_R.T @ R(pmin))<=eps
+# Jacobian and residual are evaluated once per accepted point, jacobian.T @ jacobian and jacobian.T @ residual are
+# kept until the next accepted point, so a rejected step only evaluates the residual at the trial point.
 
 # Input Definition:
-# R: error vector class with methods .residual() and .jacobian()
+# R: error vector class with methods .residual() and .jacobian(). Alternatively a streaming error vector class with
+# methods .normalEquations() returning [jacobian.T @ jacobian, jacobian.T @ residual, residual.T @ residual] and
+# .squaredResidualNorm(), e.g. streamingLeastSquaresModel, then residual and jacobian are never stored and only
+# solver 'cg' with exact jacobians is available.
 # p0: column vector in R**n (parameter point), starting point.
 # eps: positive value, tolerance for termination. Default value: 1.0e-4.
 # alpha0: positive value, starting value for damping. Default value: 1.0e-3.
 # beta: positive value bigger than 1, scaling factor for alpha. Default value: 100.
 # verbose: bool, if set to true, verbose information is displayed.
+# matrixFree: bool, if set to true, jacobian.T @ jacobian is not formed and the damped normal equations are solved
+# with products d -> jacobian.T @ (jacobian @ d) + alpha * d. Default value: 0.
+# solver: how the damped step d = argmin norm(jacobian @ d + residual)**2 + alpha * norm(D @ d)**2 is computed, with
+# D = I unless scaling is set. Default value: 'cg'
+#   'cg': PrecCGSolver on the damped normal equations (jacobian.T @ jacobian + alpha * D**2) @ d = -jacobian.T @ residual
+#   'qr': jacobian = Q @ T is factorized once per accepted point, every alpha only needs the QR of [T; sqrt(alpha) * I]
+#   'svd': one SVD of jacobian per accepted point, every alpha is solved from the singular values in O(n**2)
+#   'cgls': CGLSSolver on the damped least squares problem, only products with jacobian and jacobian.T are needed, so
+#   jacobian.T @ jacobian is never formed, which suits large n or sparse jacobians
+# exactEvery: R.jacobian() is evaluated at the starting point and then every exactEvery accepted steps, in between
+# the jacobian is updated by Broyden's rank one secant update J + (dr - J @ dp) @ dp.T / (dp.T @ dp) from the accepted
+# steps dp and residual changes dr. Set to 0, the exact jacobian is only evaluated at the start and on restarts.
+# A restart evaluates the exact jacobian when a step with an updated jacobian is rejected or when its gradient
+# estimate is below eps, so termination is always tested with the exact jacobian. Default value: 1 (always exact).
+# damping: 'reset' resets alpha to alpha0 after an accepted step and multiplies it by beta after a rejected step.
+# 'nielsen' keeps alpha between steps and updates it from the gain ratio rho of actual and predicted decrease:
+# alpha * max(1/3, 1 - (2*rho - 1)**3) after an accepted step and alpha * nu with nu doubling after each consecutive
+# rejected step, beta is not used then. Default value: 'reset'.
+# scaling: bool, if set to true, More's diagonal scaling D = diag(max_k norm of the columns of jacobian_k) is used in the
+# damping term, which makes the step invariant to the scaling of the parameters. Default value: 0.
+# maxIter: positive integer, maximal number of steps. If None, the descent runs until termination. Default value: None.
+# The descent also stops with a warning when the damped step vanishes or alpha is no longer finite.
 
 # Output Definition:
 # pmin: column vector in R**n (parameter point)
 
 # Required files:
 # d = PrecCGSolver(A,b) from PrecCGSolver.py
+# A = linearOperator(matvec, n) from linearOperator.py
+# x = CGLSSolver(A, b, alpha) from CGLSSolver.py
+# R can be streamingLeastSquaresModel(model, xFile, fFile) from streamingLeastSquaresModel.py
 
 # Test cases:
 # p0 = np.array([[180],[0]])
@@ -31,18 +61,98 @@
 
 import numpy as np
 import PrecCGSolver as PCG
+import linearOperator as LO
+import CGLSSolver as CGLS
 
 
-def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=100, verbose=0):
+def normalOperator(J: np.array, alpha, D2=1):
+    return LO.linearOperator(lambda d: J.T @ (J @ d) + alpha * D2 * d, J.shape[1], symmetric=1)
+
+
+def factorizeJacobian(J: np.array, r: np.array, solver='cg', matrixFree=0, D=None, JTJ=None):
+    # everything the damped steps at one accepted point share, qr, svd and cgls work on J @ inv(D) with y = D @ d
+    myFactors = {'solver': solver, 'matrixFree': matrixFree, 'J': J, 'D': D}
+    if D is not None and solver in ('qr', 'svd'):
+        J = J / D.T
+    if solver == 'cg':
+        if JTJ is None and not matrixFree:
+            JTJ = J.T @ J
+        myFactors['JTJ'] = JTJ
+    elif solver == 'qr':
+        Q, T = np.linalg.qr(J)
+        myFactors['T'] = T
+        myFactors['c'] = Q.T @ r
+    elif solver == 'svd':
+        U, S, Vt = np.linalg.svd(J, full_matrices=False)
+        myFactors['S'] = S.reshape((-1, 1))
+        myFactors['Vt'] = Vt
+        myFactors['c'] = U.T @ r
+    elif solver == 'cgls':
+        myFactors['r'] = r
+        if D is not None: # J @ inv(D) as products, J itself is not copied
+            Jd = myFactors['J']
+            myFactors['J'] = LO.linearOperator(lambda y: Jd @ (y / D), Jd.shape, lambda z: (Jd.T @ z) / D)
+    else:
+        raise TypeError('unknown solver!')
+
+    return myFactors
+
+
+def dampedStep(myFactors, gradp: np.array, alpha):
+    # solves (J.T @ J + alpha * D**2) @ d = -gradp with the factors of J
+    n = gradp.shape[0]
+    D = myFactors['D']
+    if myFactors['solver'] == 'cg':
+        D2 = 1 if D is None else D ** 2
+        if myFactors['matrixFree']:
+            A = normalOperator(myFactors['J'], alpha, D2)
+        else:
+            A = myFactors['JTJ'] + alpha * (np.eye(n) if D is None else np.diagflat(D2))
+        return -PCG.PrecCGSolver(A, gradp)
+    elif myFactors['solver'] == 'cgls':
+        # tolerance relative to the right hand side (J @ inv(D)).T @ r = inv(D) @ gradp, its scale changes with D
+        delta = 1.0e-6 * np.linalg.norm(gradp if D is None else gradp / D)
+        d = CGLS.CGLSSolver(myFactors['J'], -myFactors['r'], alpha, delta)
+    elif myFactors['solver'] == 'qr':
+        T = myFactors['T']
+        Qa, Ta = np.linalg.qr(np.vstack([T, np.sqrt(alpha) * np.eye(n)]))
+        d = -np.linalg.solve(Ta, Qa[:T.shape[0], :].T @ myFactors['c'])
+    else:
+        S = myFactors['S']
+        d = -myFactors['Vt'].T @ (S / (S ** 2 + alpha) * myFactors['c'])
+
+    if D is not None:
+        d = d / D
+
+    return d
+
+
+def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=100, verbose=0, matrixFree=0, solver='cg', exactEvery=1, damping='reset', scaling=0, maxIter=None):
     if eps <= 0:
         raise TypeError('range of eps is wrong!')
 
+    if solver not in ('cg', 'qr', 'svd', 'cgls'):
+        raise TypeError('unknown solver!')
+
     if alpha0 <= 0:
         raise TypeError('range of alpha0 is wrong!')
 
     if beta <= 1:
         raise TypeError('range of beta is wrong!')
 
+    if exactEvery < 0:
+        raise TypeError('range of exactEvery is wrong!')
+
+    if damping not in ('reset', 'nielsen'):
+        raise TypeError('unknown damping!')
+
+    if maxIter is not None and maxIter < 1:
+        raise TypeError('range of maxIter is wrong!')
+
+    streaming = hasattr(R, 'normalEquations')
+    if streaming and (solver != 'cg' or matrixFree or exactEvery != 1):
+        raise TypeError('streaming error vector needs solver cg with matrixFree 0 and exactEvery 1!')
+
     if verbose:
         print('Start levenbergMarquardtDescent...')
 
@@ -52,20 +162,110 @@ def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=1
     # INCOMPLETE CODE STARTS
 
     p = p0 # initialize with starting point
-    alpha = alpha0 # initialize with starting value for damping
+    alpha = float(alpha0) # initialize with starting value for damping, float so that it overflows to inf
+
+    r = None # residual at current point, never stored when streaming
+    JTJ = None # normal matrix, only given directly when streaming
+    if not streaming:
+        r = R.residual(p) # residual at current point
+        cost = 0.5 * r.T @ r # objective value at current point
+    needExact = 1 # request exact jacobian at current point
+    countExact = 0 # number of exact jacobian evaluations
+    countBroyden = 0 # number of jacobians obtained by secant updates instead
+    countAccepted = 0 # number of accepted steps, each needs a jacobian
+    countRejected = 0 # number of rejected steps, each costs a linear solve and a residual
+    nu = 2.0 # growth factor of alpha for nielsen damping
+    D = None # diagonal scaling, column vector of the diagonal of D
+    newJacobian = 0 # J changed and must be factorized
+
+    while True:
+        if needExact: # evaluate exact jacobian at current point
+            if streaming: # accumulate normal equations chunk by chunk
+                J = None
+                JTJ, gradp, rTr = R.normalEquations(p)
+                cost = 0.5 * rTr # objective value at current point
+            else:
+                J = R.jacobian(p) # jacobian at current point
+            countExact += 1 # count exact evaluation
+            isExact = 1 # jacobian is exact
+            stepsSinceExact = 0 # restart counting secant updates
+            needExact = 0 # request is served
+            newJacobian = 1 # factorize below
+
+        if newJacobian: # prepare the damped steps at current point
+            if scaling: # More's scaling by the largest column norms seen so far
+                columnNorms = np.sqrt(np.diag(JTJ)).reshape((-1, 1)) if streaming else np.linalg.norm(J, axis=0).reshape((-1, 1))
+                D = columnNorms if D is None else np.maximum(D, columnNorms)
+                D[D == 0] = 1 # keep D invertible for zero columns
+            myFactors = factorizeJacobian(J, r, solver, matrixFree, D, JTJ) # normal matrix or factorization at current point
+            if not streaming:
+                gradp = J.T @ r # gradient of 0.5*norm(r)**2 at current point
+            newJacobian = 0 # request is served
+
+        if np.linalg.norm(gradp) <= eps: # iterating until norm of jacobian times residual is below eps
+            if isExact: # terminate only with exact gradient
+                break
+            needExact = 1 # confirm with exact jacobian
+            continue
+
+        if maxIter is not None and countIter >= maxIter: # stop at the iteration cap
+            print('Warning: maxIter reached, levenbergMarquardtDescent did not converge.')
+            break
 
-    while np.linalg.norm(R.jacobian(p).T @ R.residual(p)) > eps: # iterating until norm of jacobian times residual is below eps
         countIter += 1 # increment iteration counter
-        d = -PCG.PrecCGSolver(R.jacobian(p).T @ R.jacobian(p) + alpha * np.eye(p.shape[0]), R.jacobian(p).T @ R.residual(p)) # store direction of steepest descent
-        if 0.5 * R.residual(p + d).T @ R.residual(p + d) < 0.5 * R.residual(p).T @ R.residual(p): # check if new point is better than old point
+        d = dampedStep(myFactors, gradp, alpha) # damped Gauss-Newton step from the stored factors
+        if not np.any(d) or not np.all(np.isfinite(d)): # no progress possible with this jacobian and alpha
+            if not isExact:
+                needExact = 1 # restart with exact jacobian
+                continue
+            print('Warning: damped step vanishes, levenbergMarquardtDescent stopped.')
+            break
+        if streaming:
+            rNew = None
+            costNew = 0.5 * R.squaredResidualNorm(p + d) # objective value at trial point
+        else:
+            rNew = R.residual(p + d) # residual at trial point
+            costNew = 0.5 * rNew.T @ rNew # objective value at trial point
+        if costNew < cost: # check if new point is better than old point
             p = p + d # update p with new point
-            alpha = alpha0 # reset alpha to starting value
+            if damping == 'nielsen': # adapt alpha to the gain ratio
+                Dd = d if D is None else D * d # scaled step
+                predicted = 0.5 * (alpha * Dd.T @ Dd - d.T @ gradp) # decrease predicted by the damped linear model
+                rho = ((cost - costNew) / predicted).item() # gain ratio
+                alpha = alpha * max(1 / 3, 1 - (2 * rho - 1) ** 3) # decrease alpha for good agreement
+                nu = 2.0 # reset growth factor
+            else:
+                alpha = float(alpha0) # reset alpha to starting value
+            dr = None if streaming else rNew - r # change of residual along accepted step
+            countAccepted += 1 # count accepted step
+            r = rNew # accept residual of new point
+            cost = costNew # accept objective value of new point
+            stepsSinceExact += 1 # count steps since last exact jacobian
+            if exactEvery == 1 or stepsSinceExact == exactEvery: # exact jacobian is due
+                needExact = 1
+            else: # Broyden's rank one secant update
+                J = J + (dr - J @ d) @ d.T / (d.T @ d) # update satisfies J @ d = dr
+                countBroyden += 1 # count secant update
+                isExact = 0 # jacobian is approximate
+                newJacobian = 1 # factorize updated jacobian
+        elif not isExact: # rejected with approximate jacobian
+            countRejected += 1 # count rejected step
+            needExact = 1 # restart with exact jacobian before increasing alpha
+        elif damping == 'nielsen': # if new point is not better than old point
+            countRejected += 1 # count rejected step
+            alpha = alpha * nu # increase alpha
+            nu = 2 * nu # increase faster on consecutive rejections
         else: # if new point is not better than old point
+            countRejected += 1 # count rejected step
             alpha = alpha * beta # increase alpha
+        if not np.isfinite(alpha): # damping overflowed, steps cannot shrink any further
+            print('Warning: alpha is not finite, levenbergMarquardtDescent stopped.')
+            break
 
     # INCOMPLETE CODE ENDS
     if verbose:
-        gradp = R.jacobian(p).T @ R.residual(p)
         print('levenbergMarquardtDescent terminated after ', countIter, ' steps with norm of gradient =', np.linalg.norm(gradp))
+        print(countAccepted, ' accepted and ', countRejected, ' rejected steps')
+        print(countExact, ' exact jacobian evaluations and ', countBroyden, ' Broyden updates, ', countAccepted + 1 - countExact, ' exact evaluations saved')
 
     return p
@@ -0,0 +1,142 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Parallel least squares model objective
+
+# Purpose: Provides .residual() and .jacobian() of the least squares mapping p -> 0.5*sum_k (model(xData_k,p)-fData_k)**2
+# like leastSquaresModel, but evaluates chunks of measure points in a pool of worker processes. This pays off for models
+# that cannot be vectorized and are expensive per measure point.
+# The workers are started once and keep their copy of the model. xData, fData, p and the outputs live in shared memory:
+# p is written once per call, every task only sends the bounds of its chunk, and the workers write residual and jacobian
+# rows directly into the shared output arrays, so no data is pickled per call.
+
+# Input Definition:
+# model: objective class with methods .objective() and .setParameters() and .parameterGradient(), optionally
+# .objectiveBatch() and .parameterJacobian(), see leastSquaresModel. Must be picklable.
+# xData: matrix in R**nxN (measure points as columns)
+# fData: row vector in R**1xN (measure results)
+# workers: number of worker processes. Default value: None (all cores)
+# chunkSize: number of measure points per task. Default value: None (4 tasks per worker)
+
+# Output Definition:
+# residual(): column vector in R**N, the k-th entry is model(xData_k,p)-fData_k
+# jacobian(): matrix in R**Nxm, the [k,j]-th entry returns: partial derivative with respect to p_j of (model(xData_k,p)-fData_k)
+# close(): stops the workers and frees the shared memory, also called when used in a with statement
+
+# Required files:
+# myResidual = leastSquaresModel(model, xData, fData) from leastSquaresModel.py
+
+# Test cases:
+# p0 = np.array([[2],[3]])
+# myObjective =  simpleValleyObjective(p0)
+# xk = np.array([[0, 0, 1, 2], [1, 2, 3, 4]])
+# fk = np.array([[2, 3, 2.54, 4.76]])
+# with parallelLeastSquaresModel(myObjective, xk, fk, 2, 2) as myErrorVector:
+#     myErrorVector.residual(p0)
+#     myErrorVector.jacobian(p0)
+# should return
+# [[2], [3], [10.003], [20.002]] and [[0, 1], [1, 1], [4, 1],  [9, 1]]
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import leastSquaresModel as LS
+
+workerState = {}
+
+
+def sharedArray(name: str, shape):
+    # attaches to the shared memory block name once per process and views it as float array of the given shape
+    if name not in workerState:
+        workerState[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=float, buffer=workerState[name].buf)
+
+
+def initializeWorker(model, xName: str, fName: str, n: int, N: int):
+    workerState['model'] = model
+    workerState['xData'] = sharedArray(xName, (n, N))
+    workerState['fData'] = sharedArray(fName, (1, N))
+
+
+def evaluateChunk(kind: str, k0: int, k1: int, pName: str, outName: str, m: int):
+    xData = workerState['xData']
+    N = xData.shape[1]
+    p = sharedArray(pName, (m, 1)).copy()
+    myChunk = LS.leastSquaresModel(workerState['model'], xData[:, k0:k1], workerState['fData'][:, k0:k1])
+    if kind == 'residual':
+        sharedArray(outName, (N, 1))[k0:k1, :] = myChunk.residual(p)
+    else:
+        sharedArray(outName, (N, m))[k0:k1, :] = myChunk.jacobian(p)
+
+    return k1 - k0
+
+
+class parallelLeastSquaresModel:
+
+    def __init__(self, model, xData: np.array, fData: np.array, workers=None, chunkSize=None):
+        if workers is None:
+            workers = os.cpu_count()
+        if workers < 1:
+            raise TypeError('range of workers is wrong!')
+
+        self.model = model
+        self.n = xData.shape[0]
+        self.N = fData.shape[1]
+        if chunkSize is None:
+            chunkSize = -(-self.N // (4 * workers))
+        if chunkSize < 1:
+            raise TypeError('range of chunkSize is wrong!')
+        self.chunkSize = chunkSize
+
+        self.blocks = {}
+        self.xData = self.share('xData', np.asarray(xData, dtype=float))
+        self.fData = self.share('fData', np.asarray(fData, dtype=float))
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=initializeWorker,
+                                            initargs=(model, self.blocks['xData'].name, self.blocks['fData'].name, self.n, self.N))
+
+    def share(self, key: str, A: np.array):
+        # copies A into a new shared memory block, replacing an older block with the same key
+        self.free(key)
+        self.blocks[key] = shared_memory.SharedMemory(create=True, size=max(A.nbytes, 1))
+        myArray = np.ndarray(A.shape, dtype=float, buffer=self.blocks[key].buf)
+        myArray[:] = A
+        return myArray
+
+    def free(self, key: str):
+        if key in self.blocks:
+            self.blocks[key].close()
+            self.blocks[key].unlink()
+            del self.blocks[key]
+
+    def evaluate(self, kind: str, p: np.array):
+        m = p.shape[0]
+        if 'p' not in self.blocks or self.p.shape[0] != m:
+            # new block names for a new parameter dimension, so workers never use a stale view
+            self.p = self.share('p', np.zeros((m, 1)))
+            self.r = self.share('residual', np.zeros((self.N, 1)))
+            self.J = self.share('jacobian', np.zeros((self.N, m)))
+        self.p[:] = p
+        out = self.r if kind == 'residual' else self.J
+        outName = self.blocks[kind].name
+        tasks = [self.executor.submit(evaluateChunk, kind, k, min(k + self.chunkSize, self.N), self.blocks['p'].name, outName, m)
+                 for k in range(0, self.N, self.chunkSize)]
+        for task in tasks:
+            task.result()
+
+        return out.copy()
+
+    def residual(self, p: np.array):
+        return self.evaluate('residual', p)
+
+    def jacobian(self, p: np.array):
+        return self.evaluate('jacobian', p)
+
+    def close(self):
+        self.executor.shutdown()
+        for key in list(self.blocks):
+            self.free(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,80 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Streaming least squares model objective
+
+# Purpose: Provides .normalEquations() and .squaredResidualNorm() of the least squares mapping
+# p -> 0.5*sum_k (model(xData_k,p)-fData_k)**2 for measure data that does not fit into memory.
+# xData and fData are read chunk by chunk from .npy files through np.memmap, so neither the data, the residual nor the
+# jacobian is ever stored completely. Peak memory is O(chunkSize * m + m**2) for any number N of measure points.
+
+# Input Definition:
+# model: objective class with methods .objective() and .setParameters() and .parameterGradient(), optionally
+# .objectiveBatch() and .parameterJacobian() for vectorized evaluation of a chunk, see leastSquaresModel
+# xData: file name of a .npy file or array with a matrix in R**nxN (measure points as columns)
+# fData: file name of a .npy file or array with a row vector in R**1xN (measure results)
+# chunkSize: number of measure points evaluated at once. Default value: 65536
+
+# Output Definition:
+# normalEquations(): [jacobian.T @ jacobian, jacobian.T @ residual, residual.T @ residual] at p, matrix in R**mxm,
+# column vector in R**m and real number
+# squaredResidualNorm(): residual.T @ residual at p, real number
+
+# Required files:
+# myResidual = leastSquaresModel(model, xData, fData) from leastSquaresModel.py
+
+# Test cases:
+# p0 = np.array([[2],[3]])
+# myObjective =  simpleValleyObjective(p0)
+# np.save('xk.npy', np.array([[0, 0, 1, 2], [1, 2, 3, 4]], dtype=float))
+# np.save('fk.npy', np.array([[2, 3, 2.54, 4.76]]))
+# myErrorVector = streamingLeastSquaresModel(myObjective, 'xk.npy', 'fk.npy', 3)
+# myErrorVector.normalEquations(p0)
+# should return
+# [[[98, 14], [14, 4]], [[223.032], [35.005]], 513.149]
+
+import numpy as np
+import leastSquaresModel as LS
+
+
+class streamingLeastSquaresModel:
+
+    def __init__(self, model, xData, fData, chunkSize=65536):
+        if chunkSize < 1:
+            raise TypeError('range of chunkSize is wrong!')
+
+        self.model = model
+        self.xData = np.load(xData, mmap_mode='r') if isinstance(xData, str) else xData
+        self.fData = np.load(fData, mmap_mode='r') if isinstance(fData, str) else fData
+        self.chunkSize = chunkSize
+        self.N = self.fData.shape[1]
+        self.n = self.xData.shape[0]
+        if self.xData.shape[1] != self.N:
+            raise TypeError('xData and fData have different numbers of measure points!')
+
+    def chunks(self):
+        # yields a leastSquaresModel for every chunk, only this chunk is read from disk
+        for k in range(0, self.N, self.chunkSize):
+            xChunk = np.asarray(self.xData[:, k:k + self.chunkSize], dtype=float)
+            fChunk = np.asarray(self.fData[:, k:k + self.chunkSize], dtype=float)
+            yield LS.leastSquaresModel(self.model, xChunk, fChunk)
+
+    def normalEquations(self, p: np.array):
+        m = p.shape[0]
+        JTJ = np.zeros((m, m))
+        JTr = np.zeros((m, 1))
+        rTr = 0.0
+        for myChunk in self.chunks():
+            r = myChunk.residual(p)
+            J = myChunk.jacobian(p)
+            JTJ += J.T @ J
+            JTr += J.T @ r
+            rTr += (r.T @ r).item()
+
+        return [JTJ, JTr, rTr]
+
+    def squaredResidualNorm(self, p: np.array):
+        rTr = 0.0
+        for myChunk in self.chunks():
+            r = myChunk.residual(p)
+            rTr += (r.T @ r).item()
+
+        return rTr
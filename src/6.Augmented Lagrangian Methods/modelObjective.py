@@ -14,10 +14,12 @@
 
 # Output Definition:
 # objective(): real number, evaluation at x for parameters p
+# objectiveBatch(): row vector in R**1xm, evaluation at the m columns of X in R**3xm for parameters p
 # gradient(): vector in R**3, evaluation of gradient wrt x
 # hessian(): matrix in R**3x3, evaluation of hessian wrt x
 # setParameters(): sets p
 # parameterGradient(): vector in R**3, evaluation of gradient wrt p
+# parameterJacobian(): matrix in R**mx3, k-th row is the gradient wrt p at the k-th column of X in R**3xm
 
 # Required files:
 # < none >
@@ -48,6 +50,11 @@ class modelObjective:
             + self.p[2, 0] * np.sqrt(np.abs(x[0, 0] + 1)) * x[2, 0] ** 2
         return f
 
+    def objectiveBatch(self, X: np.array):
+        F = self.p[0, 0] * (X[1:2, :] + 1) * X[0:1, :] ** 2 + np.exp(self.p[1, 0] * X[2:3, :] + 1) * X[1:2, :] ** 2 \
+            + self.p[2, 0] * np.sqrt(np.abs(X[0:1, :] + 1)) * X[2:3, :] ** 2
+        return F
+
     def gradient(self, x: np.array):
         if x[0, 0] > -1:
             f_dx0 = 2 * self.p[0, 0] * (x[1, 0] + 1) * x[0, 0] + self.p[2, 0] / 2 * x[2, 0] ** 2 / np.sqrt(x[0, 0] + 1)
@@ -92,6 +99,15 @@ class modelObjective:
 
         return myGradP
 
+    def parameterJacobian(self, X: np.array):
+        R_dp1 = (X[1, :] + 1) * X[0, :] ** 2
+        R_dp2 = X[2, :] * np.exp(self.p[1, 0] * X[2, :] + 1) * X[1, :] ** 2
+        R_dp3 = np.sqrt(X[0, :] + 1) * X[2, :] ** 2
+
+        myJacobianP = np.column_stack([R_dp1, R_dp2, R_dp3]).astype(float)
+
+        return myJacobianP
+
     @staticmethod
     def getXData():
         xdata = np.array([[0.0, 8.0, 0.0, 8.0, 0.0, 8.0, 0.0, 8.0, 4.0, 0.0, 8.0, 4.0, 4.0, 4.0, 4.0], [-4.0, -4.0, 4.0, 4.0, -4.0, -4.0, 4.0, 4.0, 0.0, 0.0, 0.0, -4.0, 4.0, 0.0, 0.0], [-1.0, -1.0, -1.0, -1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, -1.0, 1.0]])
@@ -4,15 +4,23 @@
 # Purpose: Find t to satisfy f(x+t*d)< f(x) - sigma/t*norm(x-P(x - t*gradient))**2
 
 # Input Definition:
-# f: objective class with methods .objective() and .gradient() and .hessian()
+# f: objective class with methods .objective() and .gradient() and .hessian(). If f has a method
+# .objectiveAndGradient() returning [objective, gradient], it is used for the start point.
 # P: box projection class with method .project()
 # x: column vector in R**n (domain point)
 # d: column vector in R**n (search direction)
 # sigma: value in (0,1), marks quality of decrease. Default value: 1.0e-4.
 # verbose: bool, if set to true, verbose information is displayed
+# fx: objective value at x if already known, then f(x) is not evaluated again.
+# gradx: gradient at P(x) if already known, then the gradient is not evaluated again.
+# interpolate: bool, if set to true, t is reduced by minimizing the quadratic interpolating f(x), the decrease
+# gradx.T @ d and the rejected trial value, safeguarded to [0.1*t, 0.5*t], instead of halving. Default value: 0.
+# returnPoint: bool, if set to true, [t, xt, ft] is returned with xt = P(x+t*d) and ft = f(xt). Default value: 0.
 
 # Output Definition:
-# t: t is set to the biggest 2**m, such that 2**m satisfies the projected sufficient decrease condition
+# t: t is set to the biggest 2**m, such that 2**m satisfies the projected sufficient decrease condition.
+# With interpolate set, t is the first interpolated step satisfying it.
+# xt, ft: accepted point and its objective value, only returned if returnPoint is set
 
 # Required files:
 # <none>
@@ -33,9 +41,14 @@
 import numpy as np
 
 
-def projectedBacktrackingSearch(f, P, x: np.array, d: np.array, sigma=1.0e-4, verbose=0):
+def projectedBacktrackingSearch(f, P, x: np.array, d: np.array, sigma=1.0e-4, verbose=0, fx=None, gradx=None, interpolate=0, returnPoint=0):
     xp = P.project(x)
-    gradx = f.gradient(xp)
+    fxp = None
+    if gradx is None:
+        if hasattr(f, 'objectiveAndGradient') and fx is None:
+            fxp, gradx = f.objectiveAndGradient(xp)
+        else:
+            gradx = f.gradient(xp)
     decrease = gradx.T @ d
 
     if decrease >= 0:
@@ -51,20 +64,37 @@ def projectedBacktrackingSearch(f, P, x: np.array, d: np.array, sigma=1.0e-4, ve
     t = 1
     # INCOMPLETE CODE STARTS
     
-    # Step 3: Define W1(t)
+    # Step 3: Define W1(t), f(x) is constant and evaluated once
+    if fx is None:
+        if fxp is not None and np.array_equal(xp, x):
+            fx = fxp
+        else:
+            fx = f.objective(x)
+
     def W1(t):
         projected_point = P.project(x + t * d)
-        return f.objective(projected_point) <= f.objective(x) - (sigma / t) * np.linalg.norm(x - P.project(x - t * gradx))**2
+        ft = f.objective(projected_point)
+        return [ft <= fx - (sigma / t) * np.linalg.norm(x - P.project(x - t * gradx))**2, projected_point, ft]
 
     # Step 5: Perform backtracking
-    while not W1(t):
-        t = 0.5 * t  # Halve t
+    accepted, xt, ft = W1(t)
+    while not accepted:
+        if interpolate:
+            curvature = (ft - fx - t * decrease).item()
+            tq = -decrease.item() * t ** 2 / (2 * curvature) if curvature > 0 else beta * t
+            t = min(max(tq, 0.1 * t), beta * t)  # Minimize the interpolating quadratic
+        else:
+            t = beta * t  # Halve t
         if verbose:
             print(f"Backtracking: t = {t}")
+        accepted, xt, ft = W1(t)
 
     # INCOMPLETE CODE ENDS
 
     if verbose:
         print('projectedBacktrackingSearch terminated with t=', t)
 
+    if returnPoint:
+        return [t, xt, ft]
+
     return t
@@ -1,15 +1,21 @@
 # Optimization for Engineers - Dr.Johannes Hild
 # projected Hessian Approximation
 
-# Purpose: Approximates Hessian times direction with central differences and subject to projection
+# Purpose: Approximates Hessian times direction with central differences and subject to projection.
+# Alternatively uses forward differences or the analytic Hessian of f.
 
 # Input Definition:
 # f: objective class with methods .objective() and .gradient()
-# P: box projection class with method .project() and .activeIndexSet()
+# P: box projection class with method .project() and .activeIndexSet(), the active set is used as boolean mask
 # x: column vector in R ** n(domain point)
 # d: column vector in R ** n(search direction)
 # delta: tolerance for termination. Default value: 1.0e-6
 # verbose: bool, if set to true, verbose information is displayed
+# mode: 'central' for central differences of f.gradient() (two gradients per call), 'forward' for forward differences
+# reusing the gradient at x (one gradient per call), 'analytic' for f.hessVec(x, d) if f has it, and f.hessian(x) @ d
+# otherwise. Default value: 'central'
+# gradx: gradient of f at x, used by mode 'forward'. Is evaluated if not given.
+# hessx: Hessian of f at x, used by mode 'analytic' instead of evaluating f.hessVec() or f.hessian().
 
 # Output Definition:
 # dH: Hessian times direction, column vector in R ** n
@@ -32,18 +38,33 @@
 import numpy as np
 
 
-def projectedHessApprox(f, P, x: np.array, d: np.array, delta=1.0e-6, verbose=0):
+def projectedHessApprox(f, P, x: np.array, d: np.array, delta=1.0e-6, verbose=0, mode='central', gradx=None, hessx=None):
+
+    if mode not in ('central', 'forward', 'analytic'):
+        raise TypeError('unknown mode!')
 
     if verbose:
         print('Start projectedHessApprox...')
 
     xp = P.project(x)
-    A = P.activeIndexSet(xp)
+    A = P.activeIndexSet(xp, 1)
     dr = d.copy()
     dr[A, :] = 0
     norm_d = np.linalg.norm(dr)
     if norm_d > 0:
-        dH = 0.5*norm_d/delta*(f.gradient(x+delta/norm_d*dr)-f.gradient(x-delta/norm_d*dr))
+        if mode == 'central':
+            dH = 0.5*norm_d/delta*(f.gradient(x+delta/norm_d*dr)-f.gradient(x-delta/norm_d*dr))
+        elif mode == 'forward':
+            if gradx is None:
+                gradx = f.gradient(x)
+            dH = norm_d/delta*(f.gradient(x+delta/norm_d*dr)-gradx)
+        elif hessx is not None:
+            dH = hessx @ dr
+        elif hasattr(f, 'hessVec'):
+            dH = f.hessVec(x, dr)
+        else:
+            dH = f.hessian(x) @ dr
+        dH = np.asarray(dH, dtype=float)
         dH[A, :] = d[A, :]
     else:
         dH = d
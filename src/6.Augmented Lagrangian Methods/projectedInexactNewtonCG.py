@@ -4,7 +4,7 @@
 # Purpose: Find xmin to satisfy norm(xmin - P(xmin - gradf(xmin)))<=eps
 # Iteration: x_k = P(x_k + t_k * d_k)
 # d_k starts as a steepest descent step and then CG steps are used to improve the descent direction until negative curvature is detected or a full Newton step is made.
-# t_k results from projected backtracking
+# t_k results from projected backtracking, which reuses f(x_k) and gradf(x_k) and returns the accepted point and its value
 
 # Input Definition:
 # f: objective class with methods .objective() and .gradient()
@@ -12,6 +12,9 @@
 # x0: column vector in R ** n(domain point)
 # eps: tolerance for termination. Default value: 1.0e-3
 # verbose: bool, if set to true, verbose information is displayed
+# hessMode: 'central', 'forward' or 'analytic', see projectedHessApprox. In mode 'forward' the gradient at x_k is
+# reused in every CG step. In mode 'analytic' f needs .hessVec() or .hessian(), the latter is evaluated once per
+# outer iteration. Default value: 'central'
 
 # Output Definition:
 # xmin: column vector in R ** n(domain point)
@@ -36,7 +39,7 @@ import projectedBacktrackingSearch as PB
 import projectedHessApprox as PHA
 
 
-def projectedInexactNewtonCG(f, P, x0: np.array, eps=1.0e-3, verbose=0):
+def projectedInexactNewtonCG(f, P, x0: np.array, eps=1.0e-3, verbose=0, hessMode='central'):
 
     if eps <= 0:
         raise TypeError('range of eps is wrong!')
@@ -49,6 +52,7 @@ def projectedInexactNewtonCG(f, P, x0: np.array, eps=1.0e-3, verbose=0):
     # INCOMPLETE CODE STARTS
 
     # Step 2: Initialize ηk
+    fx = f.objective(xp)
     gradx = f.gradient(xp)
     stationarity = np.linalg.norm(xp - P.project(xp - gradx))
     eta_k = min(0.5, stationarity) * stationarity
@@ -57,13 +61,16 @@ def projectedInexactNewtonCG(f, P, x0: np.array, eps=1.0e-3, verbose=0):
         countIter += 1
 
         # Step 3a: Initialize CG variables
+        hessx = None
+        if hessMode == 'analytic' and not hasattr(f, 'hessVec'):
+            hessx = f.hessian(xp)
         xj = xp
         rj = gradx
         dj = -rj
 
         while np.linalg.norm(rj) > eta_k:
             # Step 3b.i: Approximate dA ← ∇²Ωf(xk)dj
-            dA = PHA.projectedHessApprox(f, P, xp, dj)
+            dA = PHA.projectedHessApprox(f, P, xp, dj, mode=hessMode, gradx=gradx, hessx=hessx)
 
             # Step 3b.ii: Compute ρj
             rho_j = dj.T @ dA
@@ -91,10 +98,9 @@ def projectedInexactNewtonCG(f, P, x0: np.array, eps=1.0e-3, verbose=0):
             dk = -gradx
 
         # Step 3d: Perform projected backtracking line search
-        t_k = PB.projectedBacktrackingSearch(f, P, xp, dk)
+        t_k, xp, fx = PB.projectedBacktrackingSearch(f, P, xp, dk, fx=fx, gradx=gradx, returnPoint=1)
 
         # Step 3e: Update xk and ηk
-        xp = P.project(xp + t_k * dk)
         gradx = f.gradient(xp)
         stationarity = np.linalg.norm(xp - P.project(xp - gradx))
         eta_k = min(0.5, stationarity) * stationarity
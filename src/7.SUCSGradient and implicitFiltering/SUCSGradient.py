@@ -4,7 +4,8 @@
 # Purpose: Approximates gradient of f on a scaled unit central simplex
 
 # Input Definition:
-# f: objective class with methods .objective()
+# f: objective class with methods .objective(). If f has a method .objectiveBatch() evaluating all columns of a
+# matrix, the 2n stencil points are evaluated in one vectorized call.
 # x: column vector in R ** n(domain point)
 # h: simplex edge length
 # verbose: bool, if set to true, verbose information is displayed
@@ -45,17 +46,23 @@ def SUCSGradient(f, x: np.array, h: float, verbose=0):
 
     # INCOMPLETE CODE STARTS
 
-    for i in range(x.shape[0]): # iterate over all dimensions of x
-        ej = np.zeros(x.shape) # initialize unit vector
-        ej[i,0] = 1 # set unit vector in i-th direction
+    if hasattr(f, 'objectiveBatch'): # evaluate the whole stencil at once
+        n = x.shape[0] # get dimension of x
+        F = f.objectiveBatch(np.hstack([x + h * np.eye(n), x - h * np.eye(n)])) # function values at simplex and reflected vertices
+        grad_f_h = ((F[:, :n] - F[:, n:]) / (2 * h)).T # central differences for all directions
 
-        xjs = x + h * ej # set the the simplex 
-        xjr = x - h * ej # set the reflected vertices 
+    else: # evaluate the stencil point by point
+        for i in range(x.shape[0]): # iterate over all dimensions of x
+            ej = np.zeros(x.shape) # initialize unit vector
+            ej[i,0] = 1 # set unit vector in i-th direction
 
-        fjs = f.objective(xjs).item() # get function values at the simplex 
-        fjr = f.objective(xjr).item() # get function values at the reflected vertices 
+            xjs = x + h * ej # set the the simplex 
+            xjr = x - h * ej # set the reflected vertices 
 
-        grad_f_h[i] = (fjs - fjr) / (2 * h) # compute the gradient in j-th direction
+            fjs = f.objective(xjs).item() # get function values at the simplex 
+            fjr = f.objective(xjr).item() # get function values at the reflected vertices 
+
+            grad_f_h[i] = (fjs - fjr) / (2 * h) # compute the gradient in j-th direction
 
     # INCOMPLETE CODE ENDS
 
@@ -74,19 +81,26 @@ def SUCSStencilFailure(f, x: np.array, h: float, verbose=0):
 
     # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
 
-    for i in range(x.shape[0]): # iterate over all dimensions of x
-        ej = np.zeros(x.shape) # initialize unit vector
-        ej[i] = 1 # set unit vector in j-th direction
+    if hasattr(f, 'objectiveBatch'): # evaluate x and the whole stencil at once
+        n = x.shape[0] # get dimension of x
+        F = f.objectiveBatch(np.hstack([x, x + h * np.eye(n), x - h * np.eye(n)])) # function values at x, simplex and reflected vertices
+        if F[0, 0] > np.min(F[0, 1:]): # check if some stencil point has a smaller value than x
+            stenFail = 0 # set stencil failure to false if the condition is satisfied
+
+    else: # evaluate the stencil point by point
+        for i in range(x.shape[0]): # iterate over all dimensions of x
+            ej = np.zeros(x.shape) # initialize unit vector
+            ej[i] = 1 # set unit vector in j-th direction
 
-        xjs = x + h * ej # set the the simplex
-        xjr = x - h * ej # set the reflected vertices
+            xjs = x + h * ej # set the the simplex
+            xjr = x - h * ej # set the reflected vertices
 
-        fjs = f.objective(xjs) # get function values at the simplex
-        fjr = f.objective(xjr) # get function values at the reflected vertices
+            fjs = f.objective(xjs) # get function values at the simplex
+            fjr = f.objective(xjr) # get function values at the reflected vertices
 
-        if f.objective(x) > np.min([fjs, fjr]): # check if function value at x is less than the minimum of the simplex values
-            stenFail = 0 # set stencil failure to false if the condition is satisfied
-            break # break the loop if condition is satisfied
+            if f.objective(x) > np.min([fjs, fjr]): # check if function value at x is less than the minimum of the simplex values
+                stenFail = 0 # set stencil failure to false if the condition is satisfied
+                break # break the loop if condition is satisfied
 
     # INCOMPLETE CODE ENDS
     
@@ -0,0 +1,111 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# cached objective
+
+# Purpose: cachedObjective wraps an objective class and memoizes .objective(), .gradient() and .hessian()
+# for the last few evaluated points, so descent methods can ask for the same point repeatedly at no extra cost.
+# Points are looked up with a hash of the array buffer and then compared entry by entry.
+
+# Class parameters:
+# f: objective class with methods .objective() and optionally .gradient() and .hessian()
+# size: positive integer, number of points kept in the cache. Default value: 4.
+
+# Input Definition:
+# x: column vector in R ** n (domain point)
+
+# Output Definition:
+# objective(), gradient(), hessian(): as for f, evaluated at most once per cached point
+# objectiveAndGradient(): [objective, gradient] from f.objectiveAndGradient(), only available if f provides it, so line
+# searches that check for it keep evaluating the gradient only where they need it
+# hits, misses: number of cache hits and misses over all methods
+# setParameters(): clears the cache and sets the parameters of f
+# all other methods and attributes are passed through to f
+
+# Required files:
+# < none >
+
+# Test cases:
+# myObjective = cachedObjective(bananaValleyObjective())
+# x = np.array([[0], [1]], dtype=float)
+# myObjective.gradient(x)
+# myObjective.gradient(x)
+# should return myObjective.hits = 1 and myObjective.misses = 1
+
+import collections
+import numpy as np
+
+
+def copyValue(value):
+    # callers may update returned arrays in place, the cached value has to stay untouched
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
+class cachedObjective:
+
+    def __init__(self, f, size=4):
+        if size < 1:
+            raise TypeError('range of size is wrong!')
+
+        self.f = f
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # only called for attributes that are not found on the wrapper itself
+        if 'f' not in self.__dict__: # half built instance while unpickling or copying
+            raise AttributeError(name)
+        if name == 'objectiveAndGradient' and hasattr(self.__dict__['f'], name):
+            return self.cachedObjectiveAndGradient
+        return getattr(self.__dict__['f'], name)
+
+    def entry(self, x: np.array):
+        x = np.asarray(x)
+        key = (hash(x.tobytes()), x.shape, x.dtype.str)
+        myEntry = self.entries.get(key)
+        if myEntry is None or not np.array_equal(myEntry['x'], x):
+            myEntry = {'x': x.copy()}
+            self.entries[key] = myEntry
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return myEntry
+
+    def evaluate(self, name: str, x: np.array):
+        return self.lookup(self.entry(x), name, x)
+
+    def lookup(self, myEntry: dict, name: str, x: np.array):
+        if name in myEntry:
+            self.hits += 1
+        else:
+            self.misses += 1
+            myEntry[name] = getattr(self.f, name)(x)
+        return copyValue(myEntry[name])
+
+    def objective(self, x: np.array):
+        return self.evaluate('objective', x)
+
+    def gradient(self, x: np.array):
+        return self.evaluate('gradient', x)
+
+    def hessian(self, x: np.array):
+        return self.evaluate('hessian', x)
+
+    def cachedObjectiveAndGradient(self, x: np.array):
+        myEntry = self.entry(x)
+        if 'objective' not in myEntry and 'gradient' not in myEntry:
+            # one evaluation of f, counted as one miss
+            self.misses += 1
+            myEntry['objective'], myEntry['gradient'] = self.f.objectiveAndGradient(x)
+            return [copyValue(myEntry['objective']), copyValue(myEntry['gradient'])]
+        return [self.lookup(myEntry, 'objective', x), self.lookup(myEntry, 'gradient', x)]
+
+    def setParameters(self, p):
+        self.entries.clear()
+        self.f.setParameters(p)
+
+    def clear(self):
+        self.entries.clear()
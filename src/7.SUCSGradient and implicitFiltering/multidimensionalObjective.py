@@ -29,6 +29,7 @@ class multidimensionalObjective:
     # objective: real number, evaluation of nonlinearObjective at x
     # gradient: real column vector in R**8, evaluation of the gradient with respect to x at x
     # hessian: real 8x8 matrix, evaluation of the hessian with respect to x at x
+    # objectiveBatch: row vector in R**1xm, evaluation at the m columns of X in R**8xm
     # setParameters(): sets p
     # parameterGradient(): vector in R**1, evaluation of gradient wrt p
 
@@ -48,6 +49,12 @@ class multidimensionalObjective:
         value = 0.5 * x.T @ self.A @ x - self.b.T @ x + self.p / tau # compose function from parts
         return value
 
+    def objectiveBatch(self, X: np.array):
+        xAx = np.sum(X * (self.A @ X), axis=0, keepdims=True) # store x.T @ A @ x for all columns
+        tau = 0.5 * xAx + 1 # store denominators
+        value = 0.5 * xAx - self.b.T @ X + self.p / tau # compose function values from parts
+        return value
+
     def gradient(self, x: np.array):
         tau = 0.5 * x.T @ self.A @ x + 1 # store denominator
         g = self.A @ x - self.b - self.p / (tau ** 2) * (self.A @ x) # gradient via chain rule
@@ -27,6 +27,7 @@ class noisyObjective:
 
     # Output Definition:
     # objective: real number, evaluation of nonlinearObjective at x
+    # objectiveBatch: row vector in R**1xm, evaluation at the m columns of X in R**8xm with independent noise per column
     # setParameters(): sets p
 
     # Test cases:
@@ -46,6 +47,13 @@ class noisyObjective:
         value = 0.5 * x.T @ self.A @ x - self.b.T @ x + self.p / tau + noise
         return value
 
+    def objectiveBatch(self, X: np.array):
+        noise = 0.001 * np.sin(6.28318 * np.random.random((1, X.shape[1])))
+        xAx = np.sum(X * (self.A @ X), axis=0, keepdims=True)
+        tau = 0.5 * xAx + 1
+        value = 0.5 * xAx - self.b.T @ X + self.p / tau + noise
+        return value
+
     def setParameters(self, p):
         self.p = p
 
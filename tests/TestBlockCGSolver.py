@@ -0,0 +1,62 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for BlockCGSolver
+
+# Duplicate and linearly dependent right hand sides make the kxk systems of block CG singular. The solver has to
+# terminate anyway and solve every column, with and without preconditioner and through PrecCGSolver.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import BlockCGSolver as BCG
+import PrecCGSolver as PCG
+import linearOperator as LO
+import preconditioners as PC
+
+
+A = np.array([[4, 1, 0], [1, 7, 0], [0, 0, 3]], dtype=float)
+B = np.array([[5, 10], [8, 16], [3, 6]], dtype=float)
+X = BCG.BlockCGSolver(A, B, 1.0e-6, 1)
+Xe = np.array([[1, 2], [1, 2], [1, 2]])
+if np.max(np.abs(X - Xe)) < 1.0e-6:
+    print('Check 01 okay')
+else:
+    raise Exception('BlockCGSolver does not solve the test case of the header.')
+
+
+n = 30
+myRandom = np.random.default_rng(0)
+C = myRandom.standard_normal((n, n))
+A = C @ C.T + n * np.eye(n)
+b = myRandom.standard_normal((n, 1))
+c = myRandom.standard_normal((n, 1))
+B = np.hstack([b, b, 2 * b, c, b + c])
+X = BCG.BlockCGSolver(A, B, 1.0e-8, 0, 10 * n)
+if np.max(np.linalg.norm(A @ X - B, axis=0)) <= 1.0e-8:
+    print('Check 02 okay')
+else:
+    raise Exception('BlockCGSolver does not solve duplicate right hand sides.')
+
+
+if np.max(np.abs(X[:, [0]] - X[:, [1]])) < 1.0e-8 and np.max(np.abs(2 * X[:, [0]] - X[:, [2]])) < 1.0e-8:
+    print('Check 03 okay')
+else:
+    raise Exception('BlockCGSolver returns different solutions for duplicate right hand sides.')
+
+
+for M in [PC.jacobiPreconditioner(A), PC.incompleteCholeskyPreconditioner(A)]:
+    X = BCG.BlockCGSolver(A, B, 1.0e-8, 0, 10 * n, M)
+    if np.max(np.linalg.norm(A @ X - B, axis=0)) > 1.0e-8:
+        raise Exception('preconditioned BlockCGSolver does not solve duplicate right hand sides.')
+print('Check 04 okay')
+
+
+myOperator = LO.linearOperator(lambda D: A @ D, n, symmetric=1)
+X = BCG.BlockCGSolver(myOperator, B, 1.0e-8, 0, 10 * n)
+Y = PCG.PrecCGSolver(A, B, 1.0e-8)
+if np.max(np.linalg.norm(A @ X - B, axis=0)) <= 1.0e-8 and np.max(np.linalg.norm(A @ Y - B, axis=0)) <= 1.0e-8:
+    print('Check 05 okay')
+else:
+    raise Exception('BlockCGSolver does not work with a linearOperator or from PrecCGSolver.')
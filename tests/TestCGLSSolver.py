@@ -0,0 +1,99 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for CGLSSolver
+
+# CGLSSolver has to match the solution of the damped normal equations (A.T @ A + alpha * I) @ x = A.T @ b for dense
+# matrices and matrix free operators, including non symmetric square operators, and levenbergMarquardtDescent with
+# solver='cgls' has to find the same minimum as the direct solver, also with More's scaling on the model problem.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/5.Levenberg-Marquardt Descent')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/4.Projected Methods')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import CGLSSolver as CGLS
+import linearOperator as LO
+import simpleValleyObjective as SO
+import modelObjective as MO
+import leastSquaresModel as LS
+import levenbergMarquardtDescent as LM
+
+
+def dampedNormalSolution(A: np.array, b: np.array, alpha):
+    return np.linalg.solve(A.T @ A + alpha * np.eye(A.shape[1]), A.T @ b)
+
+
+A = np.array([[1, 0], [0, 1], [1, 1]], dtype=float)
+b = np.array([[1], [1], [2]], dtype=float)
+x0 = CGLS.CGLSSolver(A, b, 0, 1.0e-6, 1)
+x1 = CGLS.CGLSSolver(A, b, 1, 1.0e-6, 1)
+if np.max(np.abs(x0 - 1)) < 1.0e-6 and np.max(np.abs(x1 - 0.75)) < 1.0e-6:
+    print('Check 01 okay')
+else:
+    raise Exception('CGLSSolver does not solve the test cases of the header.')
+
+
+myRandom = np.random.default_rng(0)
+A = myRandom.standard_normal((40, 10))
+b = myRandom.standard_normal((40, 1))
+for alpha in [0, 1.0e-2, 1, 100]:
+    x = CGLS.CGLSSolver(A, b, alpha, 1.0e-10)
+    if np.max(np.abs(x - dampedNormalSolution(A, b, alpha))) > 1.0e-8:
+        raise Exception('CGLSSolver does not match the damped normal equations.')
+print('Check 02 okay')
+
+
+myOperator = LO.linearOperator(lambda d: A @ d, A.shape, lambda z: A.T @ z)
+x = CGLS.CGLSSolver(myOperator, b, 0.5, 1.0e-10)
+if np.max(np.abs(x - dampedNormalSolution(A, b, 0.5))) < 1.0e-8:
+    print('Check 03 okay')
+else:
+    raise Exception('CGLSSolver does not work with a linearOperator.')
+
+
+J = np.array([[2, 1, 0], [0, 1, 3], [1, 0, 1]], dtype=float)
+b = np.array([[1], [2], [3]], dtype=float)
+myOperator = LO.linearOperator(lambda d: J @ d, 3, lambda z: J.T @ z)
+x = CGLS.CGLSSolver(myOperator, b, 0.5, 1.0e-10)
+xe = dampedNormalSolution(J, b, 0.5)
+if np.max(np.abs(x - xe)) < 1.0e-8 and np.max(np.abs(CGLS.CGLSSolver(J, b, 0.5, 1.0e-10) - xe)) < 1.0e-8:
+    print('Check 04 okay')
+else:
+    raise Exception('CGLSSolver does not work with non symmetric square operators.')
+
+
+try:
+    CGLS.CGLSSolver(LO.linearOperator(lambda d: J @ d, 3), b, 0.5)
+    raise Exception('CGLSSolver uses matvec as rmatvec of a non symmetric square operator.')
+except TypeError:
+    print('Check 05 okay')
+
+
+p0 = np.array([[2], [3]])
+myObjective = SO.simpleValleyObjective(p0)
+xk = np.array([[0, 0, 1, 2, 3, 4], [1, 2, 3, 4, 1, 2]])
+pe = np.array([[1.5], [-0.5]])
+myObjective.setParameters(pe)
+fk = np.array([[myObjective.objective(xk[:, [k]]) for k in range(xk.shape[1])]])
+myErrorVector = LS.leastSquaresModel(myObjective, xk, fk)
+p1 = LM.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-6, 1.0e-3, 2, 0)
+p2 = LM.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-6, 1.0e-3, 2, 0, solver='cgls')
+if np.max(np.abs(p1 - pe)) < 1.0e-4 and np.max(np.abs(p2 - pe)) < 1.0e-4:
+    print('Check 06 okay')
+else:
+    raise Exception('levenbergMarquardtDescent with solver cgls does not find the parameters of the model.')
+
+
+p0 = np.array([[0], [0], [0]])
+myObjective = MO.modelObjective(p0)
+myErrorVector = LS.leastSquaresModel(myObjective, myObjective.getXData(), myObjective.getFData())
+pe = np.array([[3], [2], [16]])
+for damping in ['reset', 'nielsen']:
+    for exactEvery in [1, 0]:
+        p1 = LM.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-4, 1.0e-3, 100, 0, solver='cg', exactEvery=exactEvery, damping=damping, scaling=1)
+        p2 = LM.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-4, 1.0e-3, 100, 0, solver='cgls', exactEvery=exactEvery, damping=damping, scaling=1)
+        if np.linalg.norm(p2 - pe) > 1.0e-1 or np.linalg.norm(p2 - p1) > 1.0e-4:
+            raise Exception('levenbergMarquardtDescent with solver cgls and scaling fails on the model problem with damping ' + damping)
+print('Check 07 okay')
@@ -0,0 +1,87 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for MoreThuenteSearch
+
+# Compares MoreThuenteSearch with WolfePowellSearch on the banana valley: the returned steps have to satisfy both
+# Wolfe-Powell conditions and BFGSDescent has to need fewer objective evaluations with MoreThuenteSearch.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/3.Wolfe-Powell Search and BFGS Descent')))
+
+import simpleValleyObjective as SO
+import bananaValleyObjective as BO
+import WolfePowellSearch as WP
+import MoreThuenteSearch as MT
+import BFGSDescent as BD
+
+
+class countingObjective:
+    # counts the evaluations of objective and gradient of f
+
+    def __init__(self, f):
+        self.f = f
+        self.countObjective = 0
+        self.countGradient = 0
+
+    def objective(self, x: np.array):
+        self.countObjective += 1
+        return self.f.objective(x)
+
+    def gradient(self, x: np.array):
+        self.countGradient += 1
+        return self.f.gradient(x)
+
+
+def wolfePowell(f, x: np.array, d: np.array, t, sigma, rho):
+    descent = (f.gradient(x).T @ d).item()
+    W1 = f.objective(x + t * d) <= f.objective(x) + t * sigma * descent
+    W2 = (f.gradient(x + t * d).T @ d).item() >= rho * descent
+    return W1 and W2
+
+
+sigma = 1.0e-3
+rho = 1.0e-2
+
+p = np.array([[0], [1]])
+myObjective = SO.simpleValleyObjective(p)
+x = np.array([[-1.01], [1]])
+d = np.array([[1], [1]])
+t = MT.MoreThuenteSearch(myObjective, x, d, sigma, rho, 1)
+if t == 1:
+    print('Check 01 okay')
+else:
+    raise Exception('MoreThuenteSearch is not recognizing t = 1 as valid starting point.')
+
+
+myObjective = BO.bananaValleyObjective()
+points = [np.array([[0], [1]]), np.array([[-1.2], [1]]), np.array([[2], [-1]]), np.array([[0.5], [0.5]])]
+for x in points:
+    x = np.array(x, dtype=float)
+    d = -myObjective.gradient(x)
+    t = MT.MoreThuenteSearch(myObjective, x, d, sigma, rho)
+    if not wolfePowell(myObjective, x, d, t, sigma, rho):
+        raise Exception('MoreThuenteSearch returns a step that violates the Wolfe-Powell conditions.')
+    tWP = WP.WolfePowellSearch(myObjective, x, d, sigma, rho)
+    if not wolfePowell(myObjective, x, d, tWP, sigma, rho):
+        raise Exception('WolfePowellSearch returns a step that violates the Wolfe-Powell conditions.')
+print('Check 02 okay')
+
+
+x0 = np.array([[0], [1]], dtype=float)
+countWP = countingObjective(BO.bananaValleyObjective())
+xminWP = BD.BFGSDescent(countWP, x0, 1.0e-6, 0, lineSearch='wolfepowell')
+countMT = countingObjective(BO.bananaValleyObjective())
+xminMT = BD.BFGSDescent(countMT, x0, 1.0e-6, 0, lineSearch='morethuente')
+print('objective evaluations: ', countWP.countObjective, ' with WolfePowellSearch, ', countMT.countObjective, ' with MoreThuenteSearch')
+xe = np.array([[1], [1]])
+if np.linalg.norm(xminWP - xe) < 1.0e-3 and np.linalg.norm(xminMT - xe) < 1.0e-3:
+    print('Check 03 okay')
+else:
+    raise Exception('BFGSDescent does not find the minimum of the banana valley with both line searches.')
+
+if countMT.countObjective < countWP.countObjective:
+    print('Check 04 okay')
+else:
+    raise Exception('MoreThuenteSearch does not save objective evaluations on the banana valley.')
@@ -0,0 +1,112 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for parallelLeastSquaresModel
+
+# Residual and jacobian evaluated by the worker processes have to equal those of leastSquaresModel for several numbers
+# of workers and chunk sizes, for vectorized models and for models that can only be evaluated point by point, returned
+# arrays must not be views of the shared memory, and levenbergMarquardtDescent has to find the same parameters with both
+# models.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/5.Levenberg-Marquardt Descent')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/4.Projected Methods')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import modelObjective as MO
+import simpleValleyObjective as SO
+import leastSquaresModel as LSM
+import parallelLeastSquaresModel as PLSM
+import levenbergMarquardtDescent as LMD
+
+
+class pointwiseObjective:
+    # hides .objectiveBatch() and .parameterJacobian(), so the workers evaluate measure points one by one
+    # defined at module level, so that it can be pickled for the worker processes
+
+    def __init__(self, model):
+        self.model = model
+
+    def objective(self, x: np.array):
+        return self.model.objective(x)
+
+    def setParameters(self, p: np.array):
+        self.model.setParameters(p)
+
+    def parameterGradient(self, x: np.array):
+        return self.model.parameterGradient(x)
+
+
+def sameModel(myParallel, myErrorVector, p: np.array):
+    return (np.array_equal(myParallel.residual(p), myErrorVector.residual(p))
+            and np.array_equal(myParallel.jacobian(p), myErrorVector.jacobian(p)))
+
+
+if __name__ == '__main__': # the worker processes import this file, so the checks must only run in the main process
+
+    p0 = np.array([[0], [0], [0]])
+    p1 = np.array([[1], [0.5], [-2]])
+    myObjective = MO.modelObjective(p0)
+    xk = myObjective.getXData()
+    fk = myObjective.getFData()
+    myErrorVector = LSM.leastSquaresModel(myObjective, xk, fk)
+    for workers, chunkSize in [(1, None), (2, 1), (2, 4), (3, 100)]:
+        with PLSM.parallelLeastSquaresModel(myObjective, xk, fk, workers, chunkSize) as myParallel:
+            if not (sameModel(myParallel, myErrorVector, p0) and sameModel(myParallel, myErrorVector, p1)):
+                raise Exception('parallelLeastSquaresModel does not match leastSquaresModel for ' + str(workers) + ' workers.')
+    print('Check 01 okay')
+
+
+    p0 = np.array([[2], [3]])
+    myObjective = SO.simpleValleyObjective(p0)
+    xk = np.array([[0, 0, 1, 2], [1, 2, 3, 4]])
+    fk = np.array([[2, 3, 2.54, 4.76]])
+    with PLSM.parallelLeastSquaresModel(myObjective, xk, fk, 2, 2) as myParallel:
+        r = myParallel.residual(p0)
+        J = myParallel.jacobian(p0)
+    if np.max(np.abs(r - np.array([[2], [3], [10.003], [20.002]]))) < 1.0e-3 and np.array_equal(J, np.array([[0, 1], [1, 1], [4, 1], [9, 1]])):
+        print('Check 02 okay')
+    else:
+        raise Exception('parallelLeastSquaresModel does not solve the test case of the header.')
+
+
+    myObjective = MO.modelObjective(np.array([[0], [0], [0]]))
+    xk = myObjective.getXData()
+    fk = myObjective.getFData()
+    myErrorVector = LSM.leastSquaresModel(myObjective, xk, fk)
+    with PLSM.parallelLeastSquaresModel(myObjective, xk, fk, 2) as myParallel:
+        r1 = myParallel.residual(p1)
+        r1[:] = 0
+        if sameModel(myParallel, myErrorVector, p1):
+            print('Check 03 okay')
+        else:
+            raise Exception('parallelLeastSquaresModel returns views of its shared output arrays.')
+
+        p0 = np.array([[0], [0], [0]])
+        pParallel = LMD.levenbergMarquardtDescent(myParallel, p0, 1.0e-4, 1.0e-3, 100, 0)
+    pDirect = LMD.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-4, 1.0e-3, 100, 0)
+    if np.array_equal(pParallel, pDirect) and np.linalg.norm(pParallel - np.array([[3], [2], [16]])) < 1.0e-1:
+        print('Check 04 okay')
+    else:
+        raise Exception('levenbergMarquardtDescent finds different parameters with parallelLeastSquaresModel.')
+
+
+    try:
+        PLSM.parallelLeastSquaresModel(myObjective, xk, fk, 0)
+        raise Exception('parallelLeastSquaresModel accepts workers = 0.')
+    except TypeError:
+        print('Check 05 okay')
+
+
+    myPointwise = pointwiseObjective(MO.modelObjective(p0))
+    if hasattr(myPointwise, 'objectiveBatch') or hasattr(myPointwise, 'parameterJacobian'):
+        raise Exception('pointwiseObjective must not provide vectorized methods.')
+    myErrorVector = LSM.leastSquaresModel(myPointwise, xk, fk)
+    for workers, chunkSize in [(1, None), (2, 1), (2, 4), (3, 100)]:
+        with PLSM.parallelLeastSquaresModel(myPointwise, xk, fk, workers, chunkSize) as myParallel:
+            if not (sameModel(myParallel, myErrorVector, p0) and sameModel(myParallel, myErrorVector, p1)):
+                raise Exception('parallelLeastSquaresModel does not match leastSquaresModel for pointwise evaluation.')
+            if not np.allclose(myParallel.jacobian(p1), LSM.leastSquaresModel(myObjective, xk, fk).jacobian(p1)):
+                raise Exception('pointwise and vectorized evaluation of parallelLeastSquaresModel differ.')
+    print('Check 06 okay')
@@ -0,0 +1,102 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for preconditionerCache
+
+# Counts hits, misses and stale hits of preconditionerCache for both keys, checks least recently used eviction and
+# stale reuse, and that PrecCGSolver and NewtonDescent still converge with a cache.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import preconditionerCache as PCC
+import preconditioners as PC
+import PrecCGSolver as PCG
+import NewtonDescent as ND
+import bananaValleyObjective as BO
+
+
+A = np.array([[4, 1, 0], [1, 7, 0], [0, 0, 3]], dtype=float)
+myCache = PCC.preconditionerCache()
+M1 = myCache.get(A)
+M2 = myCache.get(A)
+if M1 is M2 and myCache.hits == 1 and myCache.misses == 1:
+    print('Check 01 okay')
+else:
+    raise Exception('preconditionerCache does not recognize the same matrix.')
+
+
+M3 = myCache.get(A.copy())
+M4 = myCache.get(A, PC.jacobiPreconditioner)
+if M3 is not M1 and M4 is not M1 and myCache.hits == 1 and myCache.misses == 3:
+    print('Check 02 okay')
+else:
+    raise Exception('preconditionerCache with identity key mixes up copies or builders.')
+
+
+myCache = PCC.preconditionerCache(key='fingerprint')
+M1 = myCache.get(A)
+M2 = myCache.get(A.copy())
+A[2, 2] = 5
+M3 = myCache.get(A)
+if M1 is M2 and M3 is not M1 and myCache.hits == 1 and myCache.misses == 2:
+    print('Check 03 okay')
+else:
+    raise Exception('preconditionerCache with fingerprint key does not recognize copies or in place changes.')
+
+
+myCache = PCC.preconditionerCache(maxSize=2, key='fingerprint')
+matrices = [k * np.eye(3) for k in range(1, 4)]
+for B in matrices:
+    myCache.get(B)
+myCache.get(matrices[2])
+myCache.get(matrices[0])
+if myCache.hits == 1 and myCache.misses == 4 and len(myCache.entries) == 2:
+    print('Check 04 okay')
+else:
+    raise Exception('preconditionerCache does not evict the least recently used entry.')
+
+
+myCache = PCC.preconditionerCache(reuseSteps=2)
+matrices = [(4 + k) * np.eye(3) for k in range(5)]
+M = [myCache.get(B) for B in matrices]
+if M[1] is M[0] and M[2] is M[0] and M[3] is not M[0] and M[4] is M[3] and myCache.staleHits == 3 and myCache.misses == 2:
+    print('Check 05 okay')
+else:
+    raise Exception('preconditionerCache does not reuse stale preconditioners for reuseSteps requests.')
+
+
+M5 = myCache.get(np.eye(4))
+if M5 is not M[3] and myCache.staleHits == 3 and myCache.misses == 3:
+    print('Check 06 okay')
+else:
+    raise Exception('preconditionerCache reuses a stale preconditioner of a different shape.')
+
+
+myRandom = np.random.default_rng(0)
+C = myRandom.standard_normal((20, 20))
+A = C @ C.T + 20 * np.eye(20)
+b = myRandom.standard_normal((20, 1))
+myCache = PCC.preconditionerCache()
+x1 = PCG.PrecCGSolver(A, b, 1.0e-8, cache=myCache)
+x2 = PCG.PrecCGSolver(A, 2 * b, 1.0e-8, cache=myCache)
+if myCache.hits == 1 and myCache.misses == 1 and np.linalg.norm(A @ x2 - 2 * b) <= 1.0e-8:
+    print('Check 07 okay')
+else:
+    raise Exception('PrecCGSolver does not use the preconditionerCache.')
+
+
+x0 = np.array([[0], [1]], dtype=float)
+xmin = ND.NewtonDescent(BO.bananaValleyObjective(), x0, 1.0e-6, 1, reuseSteps=2)
+if np.linalg.norm(xmin - np.array([[1], [1]])) < 1.0e-3:
+    print('Check 08 okay')
+else:
+    raise Exception('NewtonDescent does not converge with stale preconditioners.')
+
+
+try:
+    ND.NewtonDescent(BO.bananaValleyObjective(), x0, 1.0e-6, 0, matrixFree=1, reuseSteps=2)
+    raise Exception('NewtonDescent accepts reuseSteps with matrixFree = 1.')
+except TypeError:
+    print('Check 09 okay')
@@ -0,0 +1,96 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for sparse incompleteCholesky
+
+# Sparse input (CSR triple and scipy.sparse) has to give the same factor L as the dense path, both for IC(0) and
+# complete Cholesky, and only the lower triangle of sparse input may be read.
+
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import incompleteCholesky as IC
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+
+def csrTriple(A: np.array):
+    # CSR triple (indptr, indices, data) of the nonzero entries of A
+    indptr = [0]
+    indices = []
+    data = []
+    for i in range(A.shape[0]):
+        for j in np.flatnonzero(A[i, :]):
+            indices.append(j)
+            data.append(A[i, j])
+        indptr.append(len(indices))
+    return (np.array(indptr), np.array(indices), np.array(data, dtype=float))
+
+
+def denseFactor(L, n: int):
+    # dense array of a factor L given as CSR triple
+    indptr, indices, data = L
+    myL = np.zeros((n, n))
+    for i in range(n):
+        myL[i, indices[indptr[i]:indptr[i + 1]]] = data[indptr[i]:indptr[i + 1]]
+    return myL
+
+
+# 2D Laplacian on a 6x6 grid, IC(0) drops fill-in, so A - L @ L.T is not zero
+m = 6
+n = m * m
+A = np.zeros((n, n))
+for i in range(m):
+    for j in range(m):
+        k = i * m + j
+        A[k, k] = 4
+        if j > 0:
+            A[k, k - 1] = A[k - 1, k] = -1
+        if i > 0:
+            A[k, k - m] = A[k - m, k] = -1
+
+Ldense = IC.incompleteCholesky(A, 1.0e-3, 1.0e-6, 0)
+Lsparse = denseFactor(IC.incompleteCholesky(csrTriple(A), 1.0e-3, 1.0e-6, 0), n)
+if np.max(np.abs(Lsparse - Ldense)) < 1.0e-10 and np.max(np.abs(Ldense[A == 0])) == 0:
+    print('Check 01 okay')
+else:
+    raise Exception('sparse IC(0) does not match the dense incompleteCholesky.')
+
+
+Lsparse = denseFactor(IC.incompleteCholesky(csrTriple(np.tril(A)), 1.0e-3, 1.0e-6, 0), n)
+if np.max(np.abs(Lsparse - Ldense)) < 1.0e-10:
+    print('Check 02 okay')
+else:
+    raise Exception('sparse incompleteCholesky does not work with the lower triangle of A alone.')
+
+
+A = np.array([[4, 1, 0], [1, 4, 0], [0, 0, 4]], dtype=float)
+Ldense = IC.incompleteCholesky(A, 4, 1.0e-6, 0)
+Lsparse = denseFactor(IC.incompleteCholesky(csrTriple(A), 4, 1.0e-6, 0), 3)
+if np.max(np.abs(Lsparse - Ldense)) < 1.0e-10:
+    print('Check 03 okay')
+else:
+    raise Exception('sparse incompleteCholesky does not shift the diagonal like the dense path.')
+
+
+A = np.array([[5, 4, 3, 2, 1], [4, 5, 2, 1, 0], [3, 2, 5, 0, 0], [2, 1, 0, 5, 0], [1, 0, 0, 0, 5]], dtype=float)
+Ldense = IC.incompleteCholesky(A, 0, -1, 0)
+Lsparse = denseFactor(IC.incompleteCholesky(csrTriple(A), 0, 1.0e-6, 0, -1), 5)
+if np.max(np.abs(Lsparse - Ldense)) < 1.0e-10 and np.max(np.abs(Lsparse @ Lsparse.T - A)) < 1.0e-10:
+    print('Check 04 okay')
+else:
+    raise Exception('sparse incompleteCholesky with unlimited fill-in is not the complete Cholesky decomposition.')
+
+
+if sp is None:
+    print('Check 05 skipped, scipy is not installed')
+else:
+    L = IC.incompleteCholesky(sp.csr_matrix(A), 0, 1.0e-6, 0, -1)
+    if sp.issparse(L) and np.max(np.abs(L.toarray() - Ldense)) < 1.0e-10:
+        print('Check 05 okay')
+    else:
+        raise Exception('incompleteCholesky does not return the same sparse factor for scipy.sparse input.')
@@ -0,0 +1,100 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Test script for streamingLeastSquaresModel
+
+# The normal equations accumulated chunk by chunk have to match jacobian.T @ jacobian, jacobian.T @ residual and
+# residual.T @ residual of leastSquaresModel for every chunk size, for arrays and .npy files, with and without
+# vectorized model methods, and levenbergMarquardtDescent has to find the same parameters with both models.
+
+import numpy as np
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/5.Levenberg-Marquardt Descent')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/4.Projected Methods')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/2.Preconditioned Conjugate Gradient Solver and Newton Descent')))
+
+import modelObjective as MO
+import leastSquaresModel as LSM
+import streamingLeastSquaresModel as SLSM
+import levenbergMarquardtDescent as LMD
+
+
+class pointwiseObjective:
+    # hides .objectiveBatch() and .parameterJacobian(), so measure points are evaluated one by one
+
+    def __init__(self, model):
+        self.model = model
+
+    def objective(self, x: np.array):
+        return self.model.objective(x)
+
+    def setParameters(self, p: np.array):
+        self.model.setParameters(p)
+
+    def parameterGradient(self, x: np.array):
+        return self.model.parameterGradient(x)
+
+
+def sameNormalEquations(myStream, myErrorVector, p: np.array):
+    JTJ, JTr, rTr = myStream.normalEquations(p)
+    r = myErrorVector.residual(p)
+    J = myErrorVector.jacobian(p)
+    scale = 1 + np.max(np.abs(J.T @ J))
+    return (np.max(np.abs(JTJ - J.T @ J)) <= 1.0e-12 * scale and np.max(np.abs(JTr - J.T @ r)) <= 1.0e-12 * scale
+            and abs(rTr - (r.T @ r).item()) <= 1.0e-12 * (1 + (r.T @ r).item())
+            and abs(myStream.squaredResidualNorm(p) - (r.T @ r).item()) <= 1.0e-12 * (1 + (r.T @ r).item()))
+
+
+p0 = np.array([[0], [0], [0]])
+p1 = np.array([[1], [0.5], [-2]])
+myObjective = MO.modelObjective(p0)
+xk = myObjective.getXData()
+fk = myObjective.getFData()
+myErrorVector = LSM.leastSquaresModel(myObjective, xk, fk)
+for chunkSize in [1, 4, 15, 100]:
+    myStream = SLSM.streamingLeastSquaresModel(myObjective, xk, fk, chunkSize)
+    if not (sameNormalEquations(myStream, myErrorVector, p0) and sameNormalEquations(myStream, myErrorVector, p1)):
+        raise Exception('streamingLeastSquaresModel does not match leastSquaresModel for chunkSize ' + str(chunkSize))
+print('Check 01 okay')
+
+
+myPointwise = pointwiseObjective(MO.modelObjective(p0))
+myStream = SLSM.streamingLeastSquaresModel(myPointwise, xk, fk, 4)
+if sameNormalEquations(myStream, LSM.leastSquaresModel(myPointwise, xk, fk), p1):
+    print('Check 02 okay')
+else:
+    raise Exception('streamingLeastSquaresModel does not match leastSquaresModel for pointwise evaluation.')
+
+
+myRandom = np.random.default_rng(0)
+N = 5000
+xLarge = myRandom.uniform(-1, 1, (3, N))
+myObjective.setParameters(np.array([[3], [2], [16]]))
+fLarge = myObjective.objectiveBatch(xLarge).reshape((1, N)) + 0.01 * myRandom.standard_normal((1, N))
+with tempfile.TemporaryDirectory() as myDirectory:
+    xFile = os.path.join(myDirectory, 'xk.npy')
+    fFile = os.path.join(myDirectory, 'fk.npy')
+    np.save(xFile, xLarge)
+    np.save(fFile, fLarge)
+    myStream = SLSM.streamingLeastSquaresModel(myObjective, xFile, fFile, 777)
+    myErrorVector = LSM.leastSquaresModel(myObjective, xLarge, fLarge)
+    if sameNormalEquations(myStream, myErrorVector, p1):
+        print('Check 03 okay')
+    else:
+        raise Exception('streamingLeastSquaresModel does not match leastSquaresModel for .npy files.')
+
+    pStream = LMD.levenbergMarquardtDescent(myStream, p0, 1.0e-4, 1.0e-3, 100, 0)
+    pDirect = LMD.levenbergMarquardtDescent(myErrorVector, p0, 1.0e-4, 1.0e-3, 100, 0)
+    del myStream
+if np.linalg.norm(pStream - pDirect) < 1.0e-6 and np.linalg.norm(pStream - np.array([[3], [2], [16]])) < 1.0e-1:
+    print('Check 04 okay')
+else:
+    raise Exception('levenbergMarquardtDescent finds different parameters with streamingLeastSquaresModel.')
+
+
+try:
+    SLSM.streamingLeastSquaresModel(myObjective, xk[:, :-1], fk)
+    raise Exception('streamingLeastSquaresModel accepts xData and fData of different length.')
+except TypeError:
+    print('Check 05 okay')